@@ -0,0 +1,113 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.db.utils import set_statement_timeout
+
+from .shopping_cart import (get_shopping_cart, render_pdf_async,
+                            shopping_cart_pdf_response)
+from .views import (IngredientViewSet, RecipeViewSet, TagViewSet,
+                    redirect_to_recipe)
+
+
+def render_view(view):
+    def run_view(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    return run_view
+
+
+def offload_view(view):
+    run_view = render_view(view)
+
+    def run_view_with_connections(request, *args, **kwargs):
+        close_old_connections()
+        try:
+            return run_view(request, *args, **kwargs)
+        finally:
+            close_old_connections()
+
+    run_read_in_thread = sync_to_async(
+        run_view_with_connections, thread_sensitive=False
+    )
+    run_write = sync_to_async(run_view, thread_sensitive=True)
+
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await run_read_in_thread(request, *args, **kwargs)
+        return await run_write(request, *args, **kwargs)
+
+    async_view.csrf_exempt = getattr(view, 'csrf_exempt', False)
+    return async_view
+
+
+def load_shopping_cart(request):
+    close_old_connections()
+    set_statement_timeout(settings.DATABASE_STATEMENT_TIMEOUTS.get('report'))
+    try:
+        request = Request(request, authenticators=[
+            authentication() for authentication
+            in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ])
+        if not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated
+        return request.user.id, get_shopping_cart(request.user)
+    finally:
+        set_statement_timeout(None)
+        close_old_connections()
+
+
+def exception_response(error):
+    response = JsonResponse(
+        {'detail': error.detail}, status=error.status_code
+    )
+    if isinstance(error, (
+        exceptions.NotAuthenticated, exceptions.AuthenticationFailed
+    )):
+        response['WWW-Authenticate'] = 'Token'
+    if getattr(error, 'wait', None):
+        response['Retry-After'] = '%d' % error.wait
+    return response
+
+
+async def download_shopping_cart(request):
+    if request.method != 'GET':
+        return exception_response(
+            exceptions.MethodNotAllowed(request.method)
+        )
+    try:
+        user_id, shopping_cart = await sync_to_async(
+            load_shopping_cart, thread_sensitive=False
+        )(request)
+        name = await render_pdf_async(user_id, shopping_cart)
+    except exceptions.APIException as error:
+        return exception_response(error)
+    return shopping_cart_pdf_response(name)
+
+
+recipe_list = offload_view(
+    RecipeViewSet.as_view({'get': 'list', 'post': 'create'})
+)
+recipe_detail = offload_view(
+    RecipeViewSet.as_view({
+        'get': 'retrieve',
+        'put': 'update',
+        'patch': 'partial_update',
+        'delete': 'destroy',
+    })
+)
+tag_list = offload_view(TagViewSet.as_view({'get': 'list'}))
+tag_detail = offload_view(TagViewSet.as_view({'get': 'retrieve'}))
+ingredient_list = offload_view(IngredientViewSet.as_view({'get': 'list'}))
+ingredient_detail = offload_view(
+    IngredientViewSet.as_view({'get': 'retrieve'})
+)
+async_redirect_to_recipe = offload_view(redirect_to_recipe)
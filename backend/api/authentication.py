@@ -0,0 +1,125 @@
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from core.bus import bus
+from core.cache import TTLCache
+
+User = get_user_model()
+
+SHARED_CACHE_KEY = 'auth-token-{}'
+TOKENS_CHANNEL = 'tokens'
+UNCACHED_USER_FIELDS = ('id', 'password', 'last_login')
+USER_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname not in UNCACHED_USER_FIELDS
+)
+INVALIDATING_USER_FIELDS = ('password', *USER_FIELDS)
+
+TokenSnapshot = namedtuple(
+    'TokenSnapshot', ('user_id', 'created', *USER_FIELDS)
+)
+
+token_cache = TTLCache(
+    settings.TOKEN_AUTH_CACHE['MAX_SIZE'],
+    settings.TOKEN_AUTH_CACHE['TTL'],
+)
+
+
+def forget_cached_tokens(channel, version, user_ids):
+    if user_ids is None:
+        token_cache.clear()
+        return
+    user_ids = set(user_ids)
+    token_cache.delete_matching(lambda snapshot: snapshot.user_id in user_ids)
+
+
+bus.subscribe(TOKENS_CHANNEL, forget_cached_tokens)
+
+
+def get_shared_cache():
+    alias = settings.TOKEN_AUTH_CACHE['SHARED_CACHE']
+    return caches[alias] if alias else None
+
+
+def invalidate_tokens(user_id, keys):
+    forget_cached_tokens(TOKENS_CHANNEL, None, [user_id])
+    shared_cache = get_shared_cache()
+    if shared_cache is not None and keys:
+        shared_cache.delete_many(
+            [SHARED_CACHE_KEY.format(key) for key in keys]
+        )
+    bus.publish(TOKENS_CHANNEL, [user_id])
+
+
+def invalidate_user_tokens(user):
+    keys = []
+    if get_shared_cache() is not None:
+        keys = list(
+            Token.objects.filter(user=user).values_list('key', flat=True)
+        )
+    invalidate_tokens(user.pk, keys)
+
+
+def get_invalidating_user_values(user):
+    return tuple(
+        user.__dict__.get(field) for field in INVALIDATING_USER_FIELDS
+    )
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    def authenticate_credentials(self, key):
+        snapshot = token_cache.get(key)
+        shared_cache = get_shared_cache()
+        if snapshot is None and shared_cache is not None:
+            snapshot = shared_cache.get(SHARED_CACHE_KEY.format(key))
+            if snapshot is not None:
+                token_cache.set(key, snapshot)
+        if snapshot is None:
+            snapshot = self.get_snapshot(key)
+            token_cache.set(key, snapshot)
+            if shared_cache is not None:
+                shared_cache.set(
+                    SHARED_CACHE_KEY.format(key),
+                    snapshot,
+                    settings.TOKEN_AUTH_CACHE['TTL']
+                )
+        user = User.from_db(
+            DEFAULT_DB_ALIAS,
+            ['id', *USER_FIELDS],
+            [snapshot.user_id, *(
+                getattr(snapshot, field) for field in USER_FIELDS
+            )],
+        )
+        token = self.get_model().from_db(
+            DEFAULT_DB_ALIAS,
+            ['key', 'user_id', 'created'],
+            [key, snapshot.user_id, snapshot.created],
+        )
+        token.user = user
+        return (user, token)
+
+    def get_snapshot(self, key):
+        try:
+            snapshot = TokenSnapshot(
+                *self.get_model().objects.values_list(
+                    'user_id',
+                    'created',
+                    *(f'user__{field}' for field in USER_FIELDS),
+                ).get(key=key)
+            )
+        except self.get_model().DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not snapshot.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+        return snapshot
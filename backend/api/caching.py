@@ -0,0 +1,126 @@
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from core.bus import bus
+
+RESPONSE_CACHE_KEY = 'response-cache:{}:{}:{}'
+
+
+def get_response_cache_version(namespace):
+    return bus.get_version(namespace)
+
+
+def bump_response_cache_version(namespace):
+    bus.publish(namespace)
+
+
+def build_compressed_response(body, content_type, request):
+    if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+        response = HttpResponse(body, content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(
+            gzip.decompress(body), content_type=content_type
+        )
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
+
+
+class CompressedResponseCacheMixin:
+    response_cache_namespace = None
+    response_cache_key = None
+
+    def get_response_cache_key(self, request):
+        if (
+            request.method != 'GET'
+            or request.accepted_renderer.format != 'json'
+        ):
+            return None
+        return RESPONSE_CACHE_KEY.format(
+            self.response_cache_namespace,
+            get_response_cache_version(self.response_cache_namespace),
+            request.get_full_path(),
+        )
+
+    def cached_action(self, handler, request, *args, **kwargs):
+        self.response_cache_key = self.get_response_cache_key(request)
+        if self.response_cache_key is not None:
+            cached = cache.get(self.response_cache_key)
+            if cached is not None:
+                return build_compressed_response(*cached, request)
+        return handler(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_action(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_action(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (
+            self.response_cache_key is None
+            or response.status_code != 200
+            or getattr(response, 'data', None) is None
+        ):
+            return response
+        response.render()
+        cache.set(
+            self.response_cache_key,
+            (gzip.compress(response.content), response['Content-Type']),
+            settings.RESPONSE_CACHE_TIMEOUT
+        )
+        return response
+
+
+class ConditionalGetMixin:
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        return None
+
+    def conditional_action(self, handler, request, *args, **kwargs):
+        validators = None
+        if request.method in ('GET', 'HEAD'):
+            validators = self.get_conditional_validators(
+                request, *args, **kwargs
+            )
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        version, last_modified = validators
+        etag = quote_etag(hashlib.md5(repr((
+            version,
+            request.accepted_renderer.format,
+            request.get_full_path(),
+        )).encode()).hexdigest())
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Accept', 'Authorization'))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_action(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_action(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,70 @@
+import binascii
+import uuid
+
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from drf_extra_fields.fields import Base64ImageField
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import ImageField
+
+BASE64_HEADER_SEPARATOR = ';base64,'
+BASE64_CHUNK_SIZE = 64 * 1024
+
+
+class DecodedUpload(TemporaryUploadedFile):
+
+    def __del__(self):
+        self.close()
+
+
+class SpooledImageField(Base64ImageField):
+
+    def to_internal_value(self, data):
+        if data in self.EMPTY_VALUES:
+            return None
+        if isinstance(data, str):
+            data = self.decode_to_temporary_file(data)
+        elif not isinstance(data, UploadedFile):
+            raise ValidationError(self.INVALID_FILE_MESSAGE)
+        extension = self.get_image_extension(data)
+        if extension not in self.ALLOWED_TYPES:
+            raise ValidationError(self.INVALID_TYPE_MESSAGE)
+        data.name = f'{self.get_file_name(data)}.{extension}'
+        return ImageField.to_internal_value(self, data)
+
+    def get_image_extension(self, upload):
+        from PIL import Image
+
+        source = (
+            upload.temporary_file_path()
+            if hasattr(upload, 'temporary_file_path') else upload
+        )
+        try:
+            with Image.open(source) as image:
+                extension = (image.format or '').lower()
+        except (OSError, ValueError):
+            raise ValidationError(self.INVALID_FILE_MESSAGE)
+        finally:
+            upload.seek(0)
+        return 'jpg' if extension == 'jpeg' else extension
+
+    def decode_to_temporary_file(self, data):
+        start = data.find(BASE64_HEADER_SEPARATOR, 0, 256)
+        start = 0 if start == -1 else start + len(BASE64_HEADER_SEPARATOR)
+        upload = DecodedUpload(f'{uuid.uuid4()}.upload', None, 0, None)
+        carry = ''
+        try:
+            for offset in range(start, len(data), BASE64_CHUNK_SIZE):
+                chunk = carry + ''.join(
+                    data[offset:offset + BASE64_CHUNK_SIZE].split()
+                )
+                end = len(chunk) - len(chunk) % 4
+                upload.file.write(binascii.a2b_base64(chunk[:end]))
+                carry = chunk[end:]
+            if carry:
+                raise ValueError('Incomplete base64 quantum')
+        except (binascii.Error, ValueError):
+            upload.close()
+            raise ValidationError(self.INVALID_FILE_MESSAGE)
+        upload.size = upload.file.tell()
+        upload.file.seek(0)
+        return upload
@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import permissions
+from rest_framework.settings import api_settings
+
+from core.db.routers import (is_user_pinned_to_primary, pin_user_to_primary,
+                             reset_read_routing, route_reads_to_replica)
+from core.db.utils import iterate_in_chunks, set_statement_timeout
+
+from .renderers import NDJSONRenderer
+
+
+class StatementTimeoutMixin:
+    statement_timeout_scope = 'default'
+
+    def get_statement_timeout_scope(self):
+        return self.statement_timeout_scope
+
+    def initial(self, request, *args, **kwargs):
+        set_statement_timeout(
+            settings.DATABASE_STATEMENT_TIMEOUTS.get(
+                self.get_statement_timeout_scope()
+            )
+        )
+        super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        set_statement_timeout(None)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaReadMixin:
+    replica_routing_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in permissions.SAFE_METHODS:
+            return
+        if (
+            request.user.is_authenticated
+            and is_user_pinned_to_primary(request.user)
+        ):
+            return
+        self.replica_routing_token = route_reads_to_replica()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self.replica_routing_token is not None:
+            reset_read_routing(self.replica_routing_token)
+            self.replica_routing_token = None
+        user = getattr(request, 'user', None)
+        if (
+            request.method not in permissions.SAFE_METHODS
+            and user is not None
+            and user.is_authenticated
+            and response.status_code < 400
+        ):
+            pin_user_to_primary(user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class SparseFieldsetMixin:
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def get_query_param_set(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        return {field for field in value.split(',') if field}
+
+    def get_requested_fields(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return None
+        return self.get_query_param_set(self.fields_query_param)
+
+    def get_expanded_fields(self):
+        return self.get_query_param_set(self.expand_query_param) or set()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_requested_fields()
+        context['expand'] = self.get_expanded_fields()
+        return context
+
+
+class NDJSONStreamMixin(StatementTimeoutMixin):
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+    stream_permission_classes = [permissions.IsAuthenticated]
+    stream_chunk_size = settings.NDJSON_STREAM_CHUNK_SIZE
+    stream_max_rows = settings.NDJSON_STREAM_MAX_ROWS
+
+    def check_stream_permissions(self, request):
+        for permission_class in self.stream_permission_classes:
+            permission = permission_class()
+            if not permission.has_permission(request, self):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None),
+                )
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != NDJSONRenderer.format:
+            return super().list(request, *args, **kwargs)
+        self.check_stream_permissions(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            self.stream_records(
+                queryset.using(queryset.db)[:self.stream_max_rows],
+                settings.DATABASE_STATEMENT_TIMEOUTS.get(
+                    self.get_statement_timeout_scope()
+                ),
+            ),
+            content_type=NDJSONRenderer.media_type,
+        )
+
+    def stream_records(self, queryset, statement_timeout):
+        renderer = NDJSONRenderer()
+        set_statement_timeout(statement_timeout)
+        try:
+            for chunk in iterate_in_chunks(queryset, self.stream_chunk_size):
+                yield renderer.render(
+                    self.get_serializer(chunk, many=True).data
+                )
+        finally:
+            set_statement_timeout(None)
@@ -1,10 +1,156 @@
-from rest_framework.pagination import (LimitOffsetPagination,
-                                       PageNumberPagination)
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from datetime import timedelta
 
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.pagination import (BasePagination, LimitOffsetPagination,
+                                       PageNumberPagination, _positive_int)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
-class AuthorRecipesPagination(LimitOffsetPagination):
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Курсор устарел, загрузите данные заново'
+    default_code = 'cursor_expired'
+
+
+class LimitedOffsetPagination(LimitOffsetPagination):
+    max_limit = settings.API_MAX_PAGE_SIZE
+
+
+class AuthorRecipesPagination(LimitedOffsetPagination):
     limit_query_param = 'recipes_limit'
 
 
 class RecipePagination(PageNumberPagination):
     page_size_query_param = 'limit'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class FeedPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = settings.API_MAX_PAGE_SIZE
+    invalid_cursor_message = 'Неверный курсор'
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_position(self, request):
+        return self.decode_position(
+            request.query_params.get(self.cursor_query_param)
+        )
+
+    def decode_position(self, encoded):
+        if encoded is None:
+            return None
+        try:
+            pub_date, recipe_id = b64decode(
+                encoded.encode('ascii'), altchars=b'-_', validate=True
+            ).decode('ascii').split('|')
+            position = (parse_datetime(pub_date), int(recipe_id))
+        except (BinasciiError, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_position(self, position):
+        pub_date, recipe_id = position
+        return b64encode(
+            f'{pub_date.isoformat()}|{recipe_id}'.encode('ascii'),
+            altchars=b'-_'
+        ).decode('ascii')
+
+    def paginate_entries(self, entries, limit, request):
+        self.request = request
+        self.next_position = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            recipe_id, pub_date = entries[-1]
+            self.next_position = (pub_date, recipe_id)
+        return entries
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_position(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+class ChangesPagination(FeedPagination):
+    cursor_query_param = 'since'
+    page_query_param = 'after'
+    overlap = timedelta(seconds=settings.CHANGES_CURSOR_OVERLAP)
+    retention = timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+
+    def get_client_position(self, request):
+        return self.decode_position(
+            request.query_params.get(self.page_query_param)
+            or request.query_params.get(self.cursor_query_param)
+        )
+
+    def get_position(self, request):
+        position = self.get_client_position(request)
+        if position is None:
+            return None
+        if position[0] < timezone.now() - self.retention:
+            raise CursorExpired
+        if self.page_query_param in request.query_params:
+            return position
+        return (position[0] - self.overlap, 0)
+
+    def paginate_entries(self, entries, limit, request):
+        self.request = request
+        self.position = self.get_client_position(request)
+        self.next_position = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            self.next_position = entries[-1][:2]
+        if entries and (
+            self.position is None or entries[-1][:2] > self.position
+        ):
+            self.position = entries[-1][:2]
+        return entries
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.encode_position(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'since': (
+                self.encode_position(self.position)
+                if self.position is not None else None
+            ),
+            'results': data,
+        })
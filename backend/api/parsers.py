@@ -0,0 +1,35 @@
+import orjson
+from django.utils.datastructures import MultiValueDict
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import DataAndFiles, JSONParser, MultiPartParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MultiPartJSONParser(MultiPartParser):
+    json_field = 'data'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        result = super().parse(stream, media_type, parser_context)
+        if self.json_field not in result.data:
+            return result
+        try:
+            data = orjson.loads(result.data[self.json_field])
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+        if not isinstance(data, dict):
+            raise ParseError(
+                'Поле %s должно содержать JSON-объект' % self.json_field
+            )
+        data.update(result.files.dict())
+        return DataAndFiles(data, MultiValueDict())
@@ -1,18 +1,38 @@
 from django.conf import settings
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import transaction
-from django.shortcuts import get_object_or_404
 from djoser.serializers import UserSerializer as DjoserUserSerializer
 from drf_extra_fields.fields import Base64ImageField
 from rest_framework import serializers
 
+from recipes import shopping_list
 from recipes.models import (Ingredient, Recipe, RecipeIngredient,
-                            ShortLinkForRecipe, Tag, User)
+                            ShoppingListItem, ShortLinkForRecipe, Tag, User)
 
+from .fields import SpooledImageField
 from .pagination import AuthorRecipesPagination
 
 
-class UserSerializer(DjoserUserSerializer):
+class SparseFieldsSerializerMixin:
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested is None or not self.is_top_level():
+            return fields
+        return {
+            name: field for name, field in fields.items()
+            if name in requested
+        }
+
+    def is_top_level(self):
+        return self is self.root or (
+            self.parent is self.root
+            and isinstance(self.root, serializers.ListSerializer)
+        )
+
+
+class UserSerializer(SparseFieldsSerializerMixin, DjoserUserSerializer):
     username = serializers.CharField(
         validators=(UnicodeUsernameValidator,),
     )
@@ -28,7 +48,7 @@ class UserSerializer(DjoserUserSerializer):
 
 
 class AvatarSerializer(serializers.ModelSerializer):
-    avatar = Base64ImageField(required=False)
+    avatar = SpooledImageField(required=False)
 
     class Meta:
         model = User
@@ -46,8 +66,6 @@ class AvatarSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         new_avatar = validated_data.get('avatar', None)
         if new_avatar:
-            if instance.avatar:
-                instance.avatar.delete()
             instance.avatar = new_avatar
             instance.save()
         return instance
@@ -63,10 +81,9 @@ class RecipeMinInfoSerializer(serializers.ModelSerializer):
 
 
 class SubscribeSerializer(serializers.ModelSerializer):
-    id = serializers.IntegerField()
     recipes = serializers.SerializerMethodField(read_only=True)
-    recipes_count = serializers.SerializerMethodField()
-    is_subscribed = serializers.SerializerMethodField()
+    recipes_count = serializers.IntegerField(read_only=True)
+    is_subscribed = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = User
@@ -75,63 +92,23 @@ class SubscribeSerializer(serializers.ModelSerializer):
             'last_name', 'is_subscribed', 'avatar',
             'recipes', 'recipes_count',
         )
-        read_only_fields = (
-            'email', 'username', 'first_name',
-            'last_name', 'is_subscribed', 'avatar',
-            'recipes', 'recipes_count',
-        )
+        read_only_fields = fields
 
     def get_recipes(self, obj):
-        request = self.context['request']
-        queruset = obj.recipes.all()
-        paginator = AuthorRecipesPagination()
-        page = paginator.paginate_queryset(queruset, request)
-
-        if page is not None:
-            serializer = RecipeMinInfoSerializer(
-                page,
-                many=True,
-            )
-        else:
-            serializer = RecipeMinInfoSerializer(
-                queruset,
-                many=True,
+        recipes = getattr(obj, 'latest_recipes', None)
+        if recipes is None:
+            limit = AuthorRecipesPagination().get_limit(
+                self.context['request']
             )
-        return serializer.data
-
-    def get_recipes_count(self, obj):
-        return obj.recipes.all().count()
-
-    def get_is_subscribed(self, obj):
-        request = self.context.get('request')
-        if request.user.is_authenticated:
-            return request.user.subscription.filter(id=obj.id).exists()
-        return False
-
-    def validate(self, data):
-        author = get_object_or_404(
-            User,
-            id=data['id']
+            recipes = obj.recipes.only(
+                *RecipeMinInfoSerializer.Meta.fields
+            ).order_by('-pub_date', '-id')[:limit]
+        serializer = RecipeMinInfoSerializer(
+            recipes,
+            many=True,
+            context=self.context,
         )
-        user = self.context['request'].user
-
-        if author == user:
-            raise serializers.ValidationError(
-                'Нельзя подписаться на самого себя'
-            )
-
-        if user.subscription.filter(id=author.id).exists():
-            raise serializers.ValidationError(
-                'Подписка на выбранного автора уже создана'
-            )
-
-        return data
-
-    def create(self, validated_data):
-        user = self.context['request'].user
-        author = get_object_or_404(User, id=validated_data['id'])
-        user.subscription.add(author)
-        return author
+        return serializer.data
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -177,7 +154,7 @@ class BaseRecipeSerializer(serializers.ModelSerializer):
     )
     author = UserSerializer(read_only=True)
     text = serializers.CharField(required=True,)
-    image = Base64ImageField(required=True)
+    image = SpooledImageField(required=True)
     name = serializers.CharField(
         max_length=settings.RECIPE_NAME_MAX,
     )
@@ -263,13 +240,20 @@ class RecipeWriteSerializer(BaseRecipeSerializer):
             for ingredient_data in ingredients_data
         ]
         RecipeIngredient.objects.bulk_create(ingredients_for_recipe)
+        return {
+            ingredient.ingredient_id: ingredient.amount
+            for ingredient in ingredients_for_recipe
+        }
 
     @transaction.atomic
     def create(self, validated_data):
         ingredients_data = validated_data.pop('recipe_ingredient')
         tags = validated_data.pop('tags')
         recipe = Recipe.objects.create(**validated_data)
-        self.create_ingredietn_for_recipe(recipe, ingredients_data)
+        shopping_list.add_recipe_ingredients(
+            recipe.id,
+            self.create_ingredietn_for_recipe(recipe, ingredients_data)
+        )
         recipe.tags.set(tags)
         return recipe
 
@@ -278,18 +262,28 @@ class RecipeWriteSerializer(BaseRecipeSerializer):
         ingredients_data = validated_data.pop('recipe_ingredient')
         tags = validated_data.pop('tags')
         current_recipe = super().update(instance, validated_data)
-        current_recipe.recipe_ingredient.all().delete()
-        self.create_ingredietn_for_recipe(current_recipe, ingredients_data)
+        previous_amounts = dict(
+            current_recipe.recipe_ingredient.values_list(
+                'ingredient_id', 'amount'
+            )
+        )
+        recipe_ingredients = current_recipe.recipe_ingredient.all()
+        recipe_ingredients._raw_delete(recipe_ingredients.db)
+        shopping_list.replace_recipe_ingredients(
+            current_recipe.id,
+            previous_amounts,
+            self.create_ingredietn_for_recipe(current_recipe, ingredients_data)
+        )
         current_recipe.tags.set(tags)
         return current_recipe
 
     def to_representation(self, instance):
         return RecipeReadSerializer(
-            self.context
+            context=self.context
         ).to_representation(instance)
 
 
-class RecipeReadSerializer(BaseRecipeSerializer):
+class RecipeReadSerializer(SparseFieldsSerializerMixin, BaseRecipeSerializer):
     tags = TagSerializer(many=True)
     is_favorited = serializers.BooleanField(required=False, default=False)
     is_in_shopping_cart = serializers.BooleanField(
@@ -304,35 +298,38 @@ class RecipeReadSerializer(BaseRecipeSerializer):
         )
         read_only_fields = fields
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if (
+            self.context.get('fields') is not None
+            and 'author' in fields
+            and 'author' not in self.context.get('expand', ())
+        ):
+            fields['author'] = serializers.PrimaryKeyRelatedField(
+                read_only=True
+            )
+        return fields
 
-class RecipeActionSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Recipe.objects.all(), source='recipe'
-    )
 
-    class Meta:
-        model = None
-        fields = ('id',)
+class RecipeIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.RECIPE_BULK_ACTION_MAX,
+    )
 
-    def validate(self, data):
-        user = self.context['request'].user
-        if self.Meta.model.objects.filter(
-            recipe=data['recipe'],
-            user=user
-        ).exists():
-            raise serializers.ValidationError(
-                'Нельзя дважды добавить выбранный рецепт'
-            )
-        data['user'] = user
-        return data
 
-    def create(self, validated_data):
-        return self.Meta.model.objects.create(**validated_data)
+class ShoppingListItemSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='ingredient.id')
+    name = serializers.CharField(source='ingredient.name')
+    measurement_unit = serializers.CharField(
+        source='ingredient.measurement_unit'
+    )
 
-    def to_representation(self, instance):
-        return RecipeMinInfoSerializer(
-            context=self.context
-        ).to_representation(instance.recipe)
+    class Meta:
+        model = ShoppingListItem
+        fields = ('id', 'name', 'measurement_unit', 'amount')
+        read_only_fields = fields
 
 
 class ShortLinkSerializer(serializers.ModelSerializer):
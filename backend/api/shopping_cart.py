@@ -1,27 +1,107 @@
-from core.utils import ShoppingCartPdfGenerator
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+
+from core.artifacts import artifact_exists, artifact_response, store_artifact
+from core.render_pool import RenderPool, RenderPoolBusy
+from core.utils import render_shopping_cart_pdf
+
+PDF_CACHE_KEY = 'shopping-cart-pdf:{}'
+PDF_FILENAME = 'Shopping_cart.pdf'
+PDF_CONTENT_TYPE = 'application/pdf'
+
+pdf_render_pool = RenderPool(
+    'shopping-cart-pdf',
+    workers=settings.PDF_RENDER_POOL['WORKERS'],
+    max_pending=settings.PDF_RENDER_POOL['MAX_PENDING'],
+    max_per_user=settings.PDF_RENDER_POOL['MAX_PER_USER'],
+    timeout=settings.PDF_RENDER_POOL['TIMEOUT'],
+    retry_after=settings.PDF_RENDER_POOL['RETRY_AFTER'],
+    start_method=settings.PDF_RENDER_POOL['START_METHOD'],
+    cache_alias=settings.PDF_RENDER_POOL['CACHE'],
+)
+
+
+def get_shopping_cart(user):
+    return {
+        item.ingredient.name: {
+            'amount': item.amount,
+            'meas_unit': item.ingredient.measurement_unit,
+        }
+        for item in user.shopping_list.select_related(
+            'ingredient',
+        ).order_by('ingredient__name')
+    }
+
+
+def get_pdf_cache_key(shopping_cart):
+    return PDF_CACHE_KEY.format(
+        hashlib.sha256(repr(shopping_cart).encode()).hexdigest()
+    )
+
+
+def get_cached_pdf(key):
+    name = cache.get(key)
+    return name if artifact_exists(name) else None
+
+
+def store_pdf(key, pdf):
+    name = store_artifact(pdf, '.pdf')
+    cache.set(key, name, settings.PDF_RENDER_POOL['CACHE_TIMEOUT'])
+    return name
+
+
+def get_throttled(error):
+    return Throttled(
+        wait=error.retry_after,
+        detail='Список покупок сейчас формируется, повторите позже',
+    )
+
+
+def render_pdf(user, shopping_cart):
+    key = get_pdf_cache_key(shopping_cart)
+    name = get_cached_pdf(key)
+    if name is None:
+        try:
+            pdf = pdf_render_pool.run(
+                user.id,
+                render_shopping_cart_pdf,
+                shopping_cart,
+                str(settings.PDF_FONT_PATH),
+            )
+        except RenderPoolBusy as error:
+            raise get_throttled(error)
+        name = store_pdf(key, pdf)
+    return name
+
+
+async def render_pdf_async(user_id, shopping_cart):
+    key = get_pdf_cache_key(shopping_cart)
+    name = await sync_to_async(get_cached_pdf, thread_sensitive=False)(key)
+    if name is None:
+        try:
+            pdf = await pdf_render_pool.run_async(
+                user_id,
+                render_shopping_cart_pdf,
+                shopping_cart,
+                str(settings.PDF_FONT_PATH),
+            )
+        except RenderPoolBusy as error:
+            raise get_throttled(error)
+        name = await sync_to_async(store_pdf, thread_sensitive=False)(
+            key, pdf
+        )
+    return name
+
+
+def shopping_cart_pdf_response(name):
+    return artifact_response(name, PDF_FILENAME, PDF_CONTENT_TYPE)
 
 
 def shopping_cart_pdf_generator(user):
-    user_shopping_cart = user.shoppingcart_user.select_related(
-        'recipe',
-    ).prefetch_related('recipe__recipe_ingredient__ingredient',)
-
-    shopping_cart = {}
-
-    for obj_shop_cart in user_shopping_cart:
-        obj_recipe_ingred = obj_shop_cart.recipe.recipe_ingredient.all()
-        for recipe_ing in obj_recipe_ingred:
-            ingredient_name = recipe_ing.ingredient.name
-            if ingredient_name in shopping_cart:
-                shopping_cart[ingredient_name]['amount'] += (
-                    recipe_ing.amount
-                )
-            else:
-                shopping_cart[recipe_ing.ingredient.name] = {
-                    'amount': recipe_ing.amount,
-                    'meas_unit': (
-                        recipe_ing.ingredient.measurement_unit
-                    )
-                }
-    pdf_file = ShoppingCartPdfGenerator(shopping_cart)
-    return pdf_file.return_pdf()
+    return shopping_cart_pdf_response(
+        render_pdf(user, get_shopping_cart(user))
+    )
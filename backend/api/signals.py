@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from recipes.models import Ingredient, Recipe, Tag
+
+from .authentication import (get_invalidating_user_values, invalidate_tokens,
+                             invalidate_user_tokens)
+from .caching import bump_response_cache_version
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_tokens(instance.user_id, [instance.key])
+
+
+def is_last_login_update(update_fields):
+    return update_fields is not None and set(update_fields) == {'last_login'}
+
+
+@receiver(post_init, sender=User)
+def remember_invalidating_user_values(sender, instance, **kwargs):
+    instance.invalidating_values = get_invalidating_user_values(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_changed_user_tokens(sender, instance, created, **kwargs):
+    values = get_invalidating_user_values(instance)
+    if not created and values != instance.invalidating_values:
+        invalidate_user_tokens(instance)
+    instance.invalidating_values = values
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_responses(sender, update_fields=None, **kwargs):
+    if not is_last_login_update(update_fields):
+        bump_response_cache_version('users')
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_responses(sender, **kwargs):
+    bump_response_cache_version('tags')
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_ingredient_responses(sender, **kwargs):
+    bump_response_cache_version('ingredients')
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe_responses(sender, **kwargs):
+    bump_response_cache_version('recipes')
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+
+from api import async_views
+from api.views import RecipeViewSet
+from core.tests.base import benchmark, create_recipe, create_user, report
+
+
+class OffloadViewTests(SimpleTestCase):
+
+    def setUp(self):
+        self.threads = []
+
+        def view(request):
+            self.threads.append(threading.current_thread())
+            return HttpResponse()
+
+        self.view = async_views.offload_view(view)
+
+    def test_safe_methods_run_outside_the_request_thread(self):
+        for method in ('get', 'head', 'options'):
+            request = getattr(RequestFactory(), method)('/')
+            async_to_sync(self.view)(request)
+        self.assertNotIn(threading.current_thread(), self.threads)
+
+    def test_unsafe_methods_stay_thread_sensitive(self):
+        for method in ('post', 'put', 'patch', 'delete'):
+            request = getattr(RequestFactory(), method)('/')
+            async_to_sync(self.view)(request)
+        self.assertEqual(
+            self.threads, [threading.current_thread()] * 4
+        )
+
+
+@benchmark
+class RecipeListThroughputBenchmark(TransactionTestCase):
+    requests = 200
+    concurrency = 20
+
+    def setUp(self):
+        author = create_user('author')
+        for number in range(50):
+            create_recipe(author, name=f'Рецепт {number}')
+
+    def test_throughput(self):
+        factory = RequestFactory()
+        sync_view = RecipeViewSet.as_view({'get': 'list'})
+
+        started = time.perf_counter()
+        for _ in range(self.requests):
+            sync_view(factory.get('/api/recipes/')).render()
+        sync_rate = self.requests / (time.perf_counter() - started)
+
+        async def run_batch():
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def fetch():
+                async with semaphore:
+                    response = await async_views.recipe_list(
+                        factory.get('/api/recipes/')
+                    )
+                    self.assertEqual(response.status_code, 200)
+
+            await asyncio.gather(*(fetch() for _ in range(self.requests)))
+
+        started = time.perf_counter()
+        async_to_sync(run_batch)()
+        async_rate = self.requests / (time.perf_counter() - started)
+        report(
+            'recipes list, запросов в секунду',
+            sync=sync_rate,
+            offloaded=async_rate,
+        )
@@ -0,0 +1,123 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.authentication import (SHARED_CACHE_KEY, TOKENS_CHANNEL,
+                                CachedTokenAuthentication,
+                                forget_cached_tokens, token_cache)
+from core.tests.base import create_user
+
+
+class CachedTokenAuthenticationTests(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = create_user('user')
+        self.other = create_user('other')
+        self.token = Token.objects.create(user=self.user)
+        self.other_token = Token.objects.create(user=self.other)
+        self.client = self.get_client(self.token)
+
+    def get_client(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        return client
+
+    def get_me(self, client=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return (client or self.client).get('/api/users/me/')
+
+    def test_cached_token_skips_token_query(self):
+        self.get_me()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_me()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if 'authtoken_token' in query['sql']
+        ])
+
+    def test_logout_revokes_token_immediately(self):
+        self.get_me()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/auth/token/logout/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.get_me().status_code, 401)
+
+    def test_deactivation_revokes_token(self):
+        self.get_me()
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.get_me().status_code, 401)
+
+    def test_cached_user_has_no_deferred_fields(self):
+        self.get_me()
+        with self.assertNumQueries(0):
+            user, _ = CachedTokenAuthentication().authenticate_credentials(
+                self.token.key
+            )
+            self.assertEqual(
+                (user.email, user.first_name, user.is_staff, user.avatar),
+                (self.user.email, 'user', False, ''),
+            )
+        self.assertEqual(
+            user.get_deferred_fields(), {'password', 'last_login'}
+        )
+
+    def test_profile_update_refreshes_only_that_user(self):
+        other_client = self.get_client(self.other_token)
+        self.get_me()
+        self.get_me(other_client)
+        self.user.first_name = 'Новое имя'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertIsNotNone(token_cache.get(self.other_token.key))
+        self.assertEqual(self.get_me().data['first_name'], 'Новое имя')
+        self.assertEqual(
+            token_cache.get(self.token.key).first_name, 'Новое имя'
+        )
+
+    def test_password_change_invalidates_only_that_user(self):
+        other_client = self.get_client(self.other_token)
+        self.get_me()
+        self.get_me(other_client)
+        self.user.set_password('new-password')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertIsNotNone(token_cache.get(self.other_token.key))
+
+    def test_remote_invalidation_is_scoped_to_users(self):
+        other_client = self.get_client(self.other_token)
+        self.get_me()
+        self.get_me(other_client)
+        forget_cached_tokens(TOKENS_CHANNEL, 1, [self.user.id])
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertIsNotNone(token_cache.get(self.other_token.key))
+        forget_cached_tokens(TOKENS_CHANNEL, 2, None)
+        self.assertIsNone(token_cache.get(self.other_token.key))
+
+    @override_settings(TOKEN_AUTH_CACHE={
+        'MAX_SIZE': 100, 'TTL': 60, 'SHARED_CACHE': 'default'
+    })
+    def test_shared_cache_holds_no_password(self):
+        self.addCleanup(caches['default'].clear)
+        self.get_me()
+        snapshot = caches['default'].get(
+            SHARED_CACHE_KEY.format(self.token.key)
+        )
+        self.assertEqual(snapshot.user_id, self.user.id)
+        self.assertNotIn(self.user.password, repr(snapshot))
+        token_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_me().status_code, 200)
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if 'authtoken_token' in query['sql']
+        ])
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.pagination import ChangesPagination
+from core.tests.base import create_recipe, create_user
+from recipes import relations
+from recipes.models import (FavoriteTombstone, Recipe, RecipeTombstone,
+                            ShoppingCartTombstone)
+
+
+def encode(changed_at, object_id):
+    return ChangesPagination().encode_position((changed_at, object_id))
+
+
+def collect_changes(client, url):
+    results = []
+    while url:
+        response = client.get(url)
+        results.extend(response.data['results'])
+        url = response.data['next']
+    return results, response.data['since']
+
+
+class ChangesTests(APITestCase):
+
+    def setUp(self):
+        self.author = create_user('author')
+        self.reader = create_user('reader')
+        self.client.force_authenticate(self.reader)
+
+    def test_recipe_deletion_leaves_relation_tombstones(self):
+        recipe = create_recipe(self.author)
+        relations.favorites.add(self.reader, recipe.id)
+        relations.shopping_cart.add(self.reader, recipe.id)
+        recipe_id = recipe.id
+        recipe.delete()
+        self.assertTrue(FavoriteTombstone.objects.filter(
+            user=self.reader, recipe_id=recipe_id
+        ).exists())
+        self.assertTrue(ShoppingCartTombstone.objects.filter(
+            user=self.reader, recipe_id=recipe_id
+        ).exists())
+        for url in (
+            '/api/recipes/favorite/changes/',
+            '/api/recipes/shopping_cart/changes/',
+        ):
+            results, _ = collect_changes(self.client, url)
+            self.assertEqual(
+                [(result['id'], result['deleted']) for result in results],
+                [(recipe_id, True)],
+            )
+
+    def test_since_returns_changes_committed_with_earlier_time(self):
+        first = create_recipe(self.author)
+        _, since = collect_changes(self.client, '/api/recipes/changes/')
+        late = create_recipe(self.author)
+        Recipe.objects.filter(pk=late.pk).update(
+            updated_at=first.updated_at - timedelta(seconds=1)
+        )
+        results, new_since = collect_changes(
+            self.client, f'/api/recipes/changes/?since={since}'
+        )
+        self.assertIn(late.id, [result['id'] for result in results])
+        self.assertEqual(new_since, since)
+
+    def test_next_pages_are_exact_inside_overlap(self):
+        recipes = [create_recipe(self.author) for _ in range(5)]
+        since = encode(recipes[0].updated_at, recipes[0].id)
+        results, _ = collect_changes(
+            self.client, f'/api/recipes/changes/?since={since}&limit=2'
+        )
+        self.assertEqual(
+            [result['id'] for result in results],
+            [recipe.id for recipe in recipes],
+        )
+
+    def test_expired_since_is_gone(self):
+        since = encode(
+            timezone.now()
+            - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS + 1),
+            0,
+        )
+        response = self.client.get(f'/api/recipes/changes/?since={since}')
+        self.assertEqual(response.status_code, 410)
+
+    def test_purge_removes_only_expired_tombstones(self):
+        recipe = create_recipe(self.author)
+        relations.favorites.add(self.reader, recipe.id)
+        relations.favorites.remove(self.reader, recipe.id)
+        RecipeTombstone.objects.create(recipe_id=recipe.id)
+        expired = timezone.now() - timedelta(
+            days=settings.TOMBSTONE_RETENTION_DAYS + 1
+        )
+        FavoriteTombstone.objects.update(deleted_at=expired)
+        RecipeTombstone.objects.create(recipe_id=recipe.id + 1)
+        RecipeTombstone.objects.filter(recipe_id=recipe.id).update(
+            deleted_at=expired
+        )
+        call_command('purge_tombstones', stdout=open('/dev/null', 'w'))
+        self.assertFalse(FavoriteTombstone.objects.exists())
+        self.assertEqual(
+            list(RecipeTombstone.objects.values_list('recipe_id', flat=True)),
+            [recipe.id + 1],
+        )
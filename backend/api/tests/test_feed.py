@@ -0,0 +1,71 @@
+import time
+
+from rest_framework.test import APIClient, APITestCase
+
+from core.tests.base import (benchmark, bulk_create_recipes, bulk_create_users,
+                             create_recipe, create_user, report)
+
+
+def collect_feed(client, limit):
+    ids = []
+    url = f'/api/recipes/feed/?limit={limit}'
+    while url:
+        response = client.get(url)
+        ids.extend(recipe['id'] for recipe in response.data['results'])
+        url = response.data['next']
+    return ids
+
+
+class FeedTests(APITestCase):
+
+    def test_feed_pages_through_followed_authors(self):
+        reader = create_user('reader')
+        followed = [create_user(f'followed{number}') for number in range(3)]
+        stranger = create_user('stranger')
+        reader.subscription.set(followed)
+        expected = [
+            create_recipe(author).id
+            for _ in range(3)
+            for author in followed
+        ]
+        create_recipe(stranger)
+        self.client.force_authenticate(reader)
+        self.assertEqual(
+            collect_feed(self.client, limit=2), list(reversed(expected))
+        )
+
+
+@benchmark
+class FeedBenchmark(APITestCase):
+    recipes_per_author = 5
+    pages = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = bulk_create_users(10000, prefix='author')
+        bulk_create_recipes(cls.authors, cls.recipes_per_author)
+
+    def measure_feed(self, follows):
+        reader = create_user(f'reader{follows}')
+        reader.subscription.set(self.authors[:follows])
+        client = APIClient()
+        client.force_authenticate(reader)
+        started = time.perf_counter()
+        response = client.get('/api/recipes/feed/?limit=20')
+        first_page = time.perf_counter() - started
+        pages = 0
+        started = time.perf_counter()
+        while response.data['next'] and pages < self.pages:
+            response = client.get(response.data['next'])
+            pages += 1
+        next_pages = (time.perf_counter() - started) / max(pages, 1)
+        return first_page, next_pages
+
+    def test_feed_latency(self):
+        for follows in (10, 1000, 10000):
+            first_page, next_pages = self.measure_feed(follows)
+            report(
+                f'feed, подписок {follows}, с',
+                first_page=first_page,
+                next_page=next_pages,
+            )
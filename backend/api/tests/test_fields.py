@@ -0,0 +1,98 @@
+import base64
+import io
+import os
+import tracemalloc
+
+from django.test import SimpleTestCase
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+from api.fields import BASE64_CHUNK_SIZE, SpooledImageField
+from core.tests.base import benchmark, report
+
+
+def make_png(size=64):
+    buffer = io.BytesIO()
+    Image.frombytes('RGB', (size, size), os.urandom(size * size * 3)).save(
+        buffer, 'PNG'
+    )
+    return buffer.getvalue()
+
+
+def measure_peak(function, *args):
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class SpooledImageFieldTests(SimpleTestCase):
+
+    def setUp(self):
+        self.field = SpooledImageField()
+        self.image = make_png(400)
+
+    def decode(self, data):
+        upload = self.field.decode_to_temporary_file(data)
+        try:
+            return upload.read()
+        finally:
+            upload.close()
+
+    def test_plain_base64(self):
+        data = 'data:image/png;base64,' + base64.b64encode(
+            self.image
+        ).decode()
+        self.assertEqual(self.decode(data), self.image)
+
+    def test_base64_with_line_breaks(self):
+        encoded = base64.encodebytes(self.image).decode()
+        self.assertGreater(len(encoded), 3 * BASE64_CHUNK_SIZE)
+        for data in (
+            encoded,
+            encoded.replace('\n', '\r\n'),
+            encoded.replace('\n', ' \n\t'),
+        ):
+            self.assertEqual(
+                self.decode('data:image/png;base64,' + data), self.image
+            )
+
+    def test_truncated_base64_is_rejected(self):
+        data = base64.b64encode(self.image).decode()[:-1]
+        with self.assertRaises(ValidationError):
+            self.field.decode_to_temporary_file(data)
+
+    def test_image_is_accepted(self):
+        upload = self.field.to_internal_value(
+            base64.encodebytes(self.image).decode()
+        )
+        self.assertTrue(upload.name.endswith('.png'))
+        self.assertEqual(upload.size, len(self.image))
+
+    def test_decoding_memory_does_not_grow_with_image(self):
+        data = base64.encodebytes(os.urandom(4 * 1024 * 1024)).decode()
+        upload, peak = measure_peak(
+            self.field.decode_to_temporary_file, data
+        )
+        upload.close()
+        self.assertLess(peak, 8 * BASE64_CHUNK_SIZE)
+
+
+@benchmark
+class SpooledImageFieldBenchmark(SimpleTestCase):
+
+    def test_peak_memory(self):
+        content = os.urandom(16 * 1024 * 1024)
+        data = base64.encodebytes(content).decode()
+        upload, spooled = measure_peak(
+            SpooledImageField().decode_to_temporary_file, data
+        )
+        upload.close()
+        _, in_memory = measure_peak(base64.b64decode, data)
+        report(
+            'декодирование 16 МБ, пик памяти, КБ',
+            spooled=spooled // 1024,
+            in_memory=in_memory // 1024,
+        )
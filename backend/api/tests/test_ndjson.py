@@ -0,0 +1,87 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import TransactionTestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api import mixins
+from api.views import RecipeViewSet
+from core.tests.base import StreamHold, call_asgi, create_recipe, create_user
+
+
+class NDJSONStreamTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        for number in range(5):
+            create_recipe(cls.user, name=f'Рецепт {number}')
+
+    def read_stream(self, response):
+        return [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+
+    def test_anonymous_stream_is_rejected(self):
+        response = self.client.get('/api/recipes/?format=ndjson')
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get('/api/users/?format=ndjson')
+        self.assertEqual(response.status_code, 401)
+
+    def test_anonymous_paginated_list_still_works(self):
+        self.assertEqual(self.client.get('/api/recipes/').status_code, 200)
+
+    def test_stream_is_capped(self):
+        self.client.force_authenticate(self.user)
+        with mock.patch.object(RecipeViewSet, 'stream_max_rows', 3):
+            response = self.client.get('/api/recipes/?format=ndjson')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(self.read_stream(response)), 3)
+
+    def test_statement_timeout_covers_stream(self):
+        self.client.force_authenticate(self.user)
+        calls = []
+        with mock.patch.object(
+            mixins, 'set_statement_timeout', side_effect=calls.append
+        ):
+            response = self.client.get('/api/recipes/?format=ndjson')
+            calls.append('response')
+            records = self.read_stream(response)
+        timeout = settings.DATABASE_STATEMENT_TIMEOUTS['default']
+        self.assertEqual(len(records), 5)
+        self.assertEqual(
+            calls, [timeout, None, 'response', timeout, None]
+        )
+
+
+class NDJSONStreamAsgiTests(TransactionTestCase):
+
+    def setUp(self):
+        user = create_user('user')
+        self.token = Token.objects.create(user=user)
+        for number in range(5):
+            create_recipe(user, name=f'Рецепт {number}')
+
+    def test_stream_does_not_block_event_loop(self):
+        hold = StreamHold()
+        with mock.patch.object(
+            mixins,
+            'iterate_in_chunks',
+            hold.wrap(mixins.iterate_in_chunks),
+        ):
+            (status, _), (stream_status, body) = async_to_sync(hold.run)(
+                call_asgi(
+                    '/api/recipes/',
+                    'format=ndjson',
+                    [(b'authorization', f'Token {self.token.key}'.encode())],
+                ),
+                call_asgi('/api/tags/'),
+            )
+        self.assertEqual(hold.released_in_time, [True])
+        self.assertEqual(status, 200)
+        self.assertEqual(stream_status, 200)
+        self.assertEqual(len(body.splitlines()), 5)
@@ -0,0 +1,63 @@
+from unittest import mock
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from core.bus import bus
+from core.tests.base import create_recipe, create_user
+from recipes import relations
+from recipes.deletion import delete_recipes
+from recipes.models import Recipe
+
+LIST_URL = '/api/recipes/'
+
+
+class RecipeListETagTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        versions = mock.patch.dict(bus.versions, clear=True)
+        versions.start()
+        self.addCleanup(versions.stop)
+        self.author = create_user('author')
+        self.reader = create_user('reader')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe = create_recipe(self.author)
+
+    def get_etag(self):
+        response = self.client.get(LIST_URL)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def assert_etag_changes(self, change):
+        etag = self.get_etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertNotEqual(self.get_etag(), etag)
+
+    def test_matching_etag_skips_recipe_queries(self):
+        etag = self.get_etag()
+        with self.assertNumQueries(0):
+            response = self.client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_creating_recipe_changes_etag(self):
+        self.assert_etag_changes(lambda: create_recipe(self.author))
+
+    def test_updating_recipe_changes_etag(self):
+        def rename():
+            self.recipe.name = 'Новое название'
+            self.recipe.save()
+
+        self.assert_etag_changes(rename)
+
+    def test_bulk_deleting_recipe_changes_etag(self):
+        self.assert_etag_changes(
+            lambda: delete_recipes(Recipe.objects.filter(pk=self.recipe.pk))
+        )
+
+    def test_favorite_changes_user_etag(self):
+        self.client.force_authenticate(self.reader)
+        self.assert_etag_changes(
+            lambda: relations.favorites.add(self.reader, self.recipe.id)
+        )
@@ -0,0 +1,78 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.tests.base import (create_ingredient, create_recipe, create_tag,
+                             create_user)
+from recipes.models import ShoppingCart, ShoppingListItem
+
+
+class RecipeUpdateShoppingListTests(TestCase):
+
+    def setUp(self):
+        self.author = create_user('author')
+        self.tag = create_tag('breakfast')
+        self.ingredients = [
+            create_ingredient(f'Ингредиент {number}') for number in range(20)
+        ]
+        self.recipe = create_recipe(
+            self.author,
+            ingredients={
+                ingredient: 10 for ingredient in self.ingredients[:10]
+            },
+            tags=[self.tag],
+        )
+        self.buyers = [create_user(f'buyer{number}') for number in range(3)]
+        for buyer in self.buyers:
+            ShoppingCart.objects.create(user=buyer, recipe=self.recipe)
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def update_ingredients(self, amounts):
+        return self.client.patch(
+            f'/api/recipes/{self.recipe.id}/',
+            {
+                'ingredients': [
+                    {'id': ingredient.id, 'amount': amount}
+                    for ingredient, amount in amounts.items()
+                ],
+                'tags': [self.tag.id],
+            },
+            format='json',
+        )
+
+    def get_shopping_list(self, user):
+        return dict(
+            ShoppingListItem.objects.filter(user=user).values_list(
+                'ingredient_id', 'amount'
+            )
+        )
+
+    def test_shopping_lists_follow_ingredient_delta(self):
+        amounts = {
+            **{ingredient: 10 for ingredient in self.ingredients[:5]},
+            **{ingredient: 25 for ingredient in self.ingredients[5:8]},
+            **{ingredient: 5 for ingredient in self.ingredients[15:]},
+        }
+        response = self.update_ingredients(amounts)
+        self.assertEqual(response.status_code, 200, response.data)
+        for buyer in self.buyers:
+            self.assertEqual(
+                self.get_shopping_list(buyer),
+                {
+                    ingredient.id: amount
+                    for ingredient, amount in amounts.items()
+                },
+            )
+
+    def test_shopping_list_queries_do_not_grow_with_ingredients(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.update_ingredients(
+                {ingredient: 7 for ingredient in self.ingredients[10:]}
+            )
+        shopping_list_queries = [
+            query for query in queries.captured_queries
+            if 'recipes_shoppinglistitem' in query['sql']
+        ]
+        self.assertLessEqual(len(shopping_list_queries), 3)
@@ -0,0 +1,66 @@
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+
+from core.tests.base import create_ingredient, create_recipe, create_user
+from recipes.models import (Favorite, FavoriteTombstone, ShoppingCart,
+                            ShoppingListItem)
+
+
+class RelationConcurrencyTests(TransactionTestCase):
+    threads = 8
+
+    def setUp(self):
+        self.user = create_user('user')
+        self.ingredient = create_ingredient('Мука')
+        self.recipe = create_recipe(
+            create_user('author'), ingredients={self.ingredient: 100}
+        )
+
+    def hammer(self, method, url):
+        barrier = threading.Barrier(self.threads)
+
+        def send_request():
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                return getattr(client, method)(url).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(self.threads) as executor:
+            return Counter(executor.map(
+                lambda _: send_request(), range(self.threads)
+            ))
+
+    def test_concurrent_favorite_is_added_once(self):
+        url = f'/api/recipes/{self.recipe.id}/favorite/'
+        self.assertEqual(
+            self.hammer('post', url), {201: 1, 400: self.threads - 1}
+        )
+        self.assertEqual(Favorite.objects.count(), 1)
+        self.assertEqual(
+            self.hammer('delete', url), {204: 1, 400: self.threads - 1}
+        )
+        self.assertFalse(Favorite.objects.exists())
+        self.assertEqual(FavoriteTombstone.objects.count(), 1)
+
+    def test_concurrent_cart_keeps_shopping_list_consistent(self):
+        url = f'/api/recipes/{self.recipe.id}/shopping_cart/'
+        self.assertEqual(
+            self.hammer('post', url), {201: 1, 400: self.threads - 1}
+        )
+        self.assertEqual(ShoppingCart.objects.count(), 1)
+        self.assertEqual(
+            list(ShoppingListItem.objects.values_list('amount', flat=True)),
+            [100],
+        )
+        self.assertEqual(
+            self.hammer('delete', url), {204: 1, 400: self.threads - 1}
+        )
+        self.assertFalse(ShoppingListItem.objects.exists())
@@ -0,0 +1,121 @@
+import datetime
+import decimal
+import gzip
+import json
+import uuid
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from api.renderers import NDJSONRenderer, ORJSONRenderer
+from core.tests.base import (create_ingredient, create_recipe, create_tag,
+                             create_user)
+from recipes.models import Favorite, ShoppingCart
+
+PAYLOADS = [
+    None,
+    [],
+    {},
+    {'text': 'Борщ', 'emoji': '🍲', 'quote': '"', 'slash': '\\/'},
+    {'separators': 'line paragraph end', 'control': '\x00\x1f'},
+    {'aware': timezone.now(), 'naive': datetime.datetime(2024, 1, 2, 3, 4)},
+    {'date': datetime.date(2024, 1, 2), 'time': datetime.time(3, 4, 5)},
+    {'delta': datetime.timedelta(minutes=5)},
+    {'decimal': decimal.Decimal('1.50'), 'uuid': uuid.uuid4()},
+    {'lazy': gettext_lazy('Invalid token.')},
+    {1: 'integer key', 'nested': {'list': [1, True, False, None]}},
+    {'big': 2 ** 53 + 1, 'negative': -1},
+    {'tuple': (1, 2), 'set': []},
+]
+
+
+class RendererCompatibilityTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        author = create_user('author')
+        cls.user.subscription.add(author)
+        tag = create_tag('завтрак')
+        ingredient = create_ingredient('Мука особая')
+        cls.recipe = create_recipe(
+            author,
+            name='Блины "домашние" 🥞',
+            ingredients={ingredient: 200},
+            tags=[tag],
+        )
+        Favorite.objects.create(user=cls.user, recipe=cls.recipe)
+        ShoppingCart.objects.create(user=cls.user, recipe=cls.recipe)
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def assertRenderedAlike(self, data):
+        self.assertEqual(
+            ORJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_payloads_render_like_drf(self):
+        for payload in PAYLOADS:
+            with self.subTest(payload=payload):
+                self.assertRenderedAlike(payload)
+
+    def test_float_values_round_trip(self):
+        data = {'values': [0.1, 1.5, 1e16, -2.5e-7]}
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+    def test_indent_falls_back_to_drf(self):
+        data = {'text': 'Борщ', 'nested': [1, 2]}
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4'),
+        )
+
+    def test_endpoints_render_like_drf(self):
+        urls = [
+            '/api/tags/',
+            '/api/ingredients/',
+            '/api/recipes/',
+            f'/api/recipes/{self.recipe.id}/',
+            '/api/recipes/?is_favorited=1',
+            '/api/recipes/feed/',
+            '/api/recipes/changes/',
+            '/api/recipes/favorite/changes/',
+            '/api/recipes/shopping_list/',
+            '/api/users/',
+            '/api/users/me/',
+            '/api/users/subscriptions/',
+            '/api/recipes/999999/',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertRenderedAlike(response.data)
+                self.assertEqual(
+                    response.content, JSONRenderer().render(response.data)
+                )
+
+    def test_cached_compressed_responses_match(self):
+        client = APIClient()
+        first = client.get('/api/ingredients/')
+        cached = client.get('/api/ingredients/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(cached['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            gzip.decompress(cached.content), JSONRenderer().render(first.data)
+        )
+
+    def test_ndjson_lines_render_like_drf(self):
+        items = [{'id': 1, 'name': 'Блины '}, {'id': 2, 'name': None}]
+        self.assertEqual(
+            NDJSONRenderer().render(items),
+            b''.join(JSONRenderer().render(item) + b'\n' for item in items),
+        )
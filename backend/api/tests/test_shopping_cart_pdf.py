@@ -0,0 +1,64 @@
+import tempfile
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import RequestFactory, TransactionTestCase
+from django.test.utils import override_settings
+from rest_framework.authtoken.models import Token
+
+from api import async_views
+from core.render_pool import RenderPoolBusy
+from core.tests.base import create_ingredient, create_recipe, create_user
+from recipes import relations
+
+
+class AsyncShoppingCartDownloadTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user('user')
+        self.token = Token.objects.create(user=self.user)
+        recipe = create_recipe(
+            self.user, ingredients={create_ingredient('Соль'): 5}
+        )
+        relations.shopping_cart.add(self.user, recipe.id)
+        artifacts_root = tempfile.TemporaryDirectory()
+        self.addCleanup(artifacts_root.cleanup)
+        settings_override = override_settings(
+            ARTIFACTS_ROOT=artifacts_root.name,
+            ARTIFACTS_X_ACCEL_REDIRECT=False,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def download(self, **headers):
+        return async_to_sync(async_views.download_shopping_cart)(
+            RequestFactory().get(
+                '/api/recipes/download_shopping_cart/', **headers
+            )
+        )
+
+    def test_anonymous_request_is_rejected(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+    def test_busy_pool_returns_retry_after(self):
+        with mock.patch(
+            'api.shopping_cart.pdf_render_pool.run_async',
+            side_effect=RenderPoolBusy(7),
+        ):
+            response = self.download(
+                HTTP_AUTHORIZATION=f'Token {self.token.key}'
+            )
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+
+    def test_pdf_is_rendered_in_pool(self):
+        response = self.download(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        content = b''.join(response.streaming_content)
+        response.close()
+        self.assertTrue(content.startswith(b'%PDF'))
@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.bus import bus
+from core.tests.base import create_ingredient, create_recipe, create_user
+
+
+class RecipeSparseFieldsTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        versions = mock.patch.dict(bus.versions, clear=True)
+        versions.start()
+        self.addCleanup(versions.stop)
+        self.author = create_user('author')
+        self.recipe = create_recipe(self.author, ingredients={
+            create_ingredient('Соль'): 1,
+        })
+        self.url = f'/api/recipes/{self.recipe.id}/'
+
+    def get(self, url, **params):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(context)
+
+    def test_detail_returns_requested_fields(self):
+        self.get(self.url)
+        full, full_queries = self.get(self.url)
+        self.assertIn('text', full)
+        with self.assertNumQueries(3):
+            data, _ = self.get(self.url, fields='id,name')
+        self.assertEqual(data, {'id': self.recipe.id, 'name': 'Рецепт'})
+        self.assertEqual(full_queries, 6)
+
+    def test_detail_expands_author_with_all_fields(self):
+        data, _ = self.get(self.url, fields='id,author', expand='author')
+        self.assertEqual(data['id'], self.recipe.id)
+        self.assertEqual(data['author']['username'], 'author')
+        self.assertIn('email', data['author'])
+
+    def test_detail_collapses_author_to_id(self):
+        data, _ = self.get(self.url, fields='id,author')
+        self.assertEqual(
+            data, {'id': self.recipe.id, 'author': self.author.id}
+        )
+
+    def test_list_expands_author_with_all_fields(self):
+        data, _ = self.get('/api/recipes/', fields='id,author',
+                           expand='author')
+        self.assertEqual(data['results'][0]['author']['username'], 'author')
+        self.assertEqual(set(data['results'][0]), {'id', 'author'})
@@ -0,0 +1,79 @@
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.tests.base import (benchmark, bulk_create_recipes, bulk_create_users,
+                             create_recipe, create_user, report)
+from recipes.models import Recipe
+
+
+class SubscriptionsTests(APITestCase):
+
+    def setUp(self):
+        self.reader = create_user('reader')
+        self.authors = [create_user(f'author{number}') for number in range(3)]
+        self.reader.subscription.set(self.authors)
+        for author in self.authors:
+            for number in range(5):
+                create_recipe(author, name=f'{author.username} {number}')
+        self.client.force_authenticate(self.reader)
+
+    def test_recipes_are_limited_per_author(self):
+        response = self.client.get(
+            '/api/users/subscriptions/?recipes_limit=2'
+        )
+        self.assertEqual(response.status_code, 200)
+        for entry in response.data['results']:
+            expected = list(
+                Recipe.objects.filter(author_id=entry['id']).order_by(
+                    '-pub_date', '-id'
+                ).values_list('id', flat=True)[:2]
+            )
+            self.assertEqual(
+                [recipe['id'] for recipe in entry['recipes']], expected
+            )
+            self.assertEqual(entry['recipes_count'], 5)
+
+    def test_query_count_does_not_depend_on_recipes(self):
+        with CaptureQueriesContext(connection) as before:
+            self.client.get('/api/users/subscriptions/?recipes_limit=2')
+        bulk_create_recipes(self.authors, 50)
+        with CaptureQueriesContext(connection) as after:
+            self.client.get('/api/users/subscriptions/?recipes_limit=2')
+        self.assertEqual(len(after), len(before))
+
+    def test_subscribe_response_is_limited(self):
+        author = create_user('new')
+        for number in range(4):
+            create_recipe(author)
+        response = self.client.post(
+            f'/api/users/{author.id}/subscribe/?recipes_limit=3'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['recipes']), 3)
+
+
+@benchmark
+class SubscriptionsBenchmark(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = create_user('reader')
+        authors = bulk_create_users(20, prefix='author')
+        cls.reader.subscription.set(authors)
+        bulk_create_recipes(authors, 2000)
+
+    def test_subscriptions_latency(self):
+        self.client.force_authenticate(self.reader)
+        started = time.perf_counter()
+        for _ in range(20):
+            response = self.client.get(
+                '/api/users/subscriptions/?limit=6&recipes_limit=3'
+            )
+        self.assertEqual(response.status_code, 200)
+        report(
+            'subscriptions, 6 авторов по 2000 рецептов, с',
+            latency=(time.perf_counter() - started) / 20,
+        )
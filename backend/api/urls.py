@@ -1,15 +1,36 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import IngredientViewSet, RecipeViewSet, TagViewSet, UserviewSet
+from .views import (ExportViewSet, IngredientViewSet, RecipeViewSet,
+                    TagViewSet, UserviewSet)
 
 router = DefaultRouter()
 router.register('users', UserviewSet, basename='users')
 router.register('tags', TagViewSet)
 router.register('ingredients', IngredientViewSet)
 router.register('recipes', RecipeViewSet, basename='recipe')
+router.register('exports', ExportViewSet, basename='exports')
 
-urlpatterns = [
+urlpatterns = []
+
+if settings.ASYNC_READ_VIEWS:
+    from . import async_views
+
+    urlpatterns += [
+        path(
+            'recipes/download_shopping_cart/',
+            async_views.download_shopping_cart,
+        ),
+        path('recipes/', async_views.recipe_list),
+        path('recipes/<int:pk>/', async_views.recipe_detail),
+        path('tags/', async_views.tag_list),
+        path('tags/<int:pk>/', async_views.tag_detail),
+        path('ingredients/', async_views.ingredient_list),
+        path('ingredients/<int:pk>/', async_views.ingredient_detail),
+    ]
+
+urlpatterns += [
     path('', include(router.urls)),
     path('auth', include('djoser.urls')),
     path('auth/', include('djoser.urls.authtoken')),
@@ -1,38 +1,64 @@
 import hashlib
 
-from django.db.models import BooleanField, Exists, OuterRef, Value
+from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, Count, Exists, Max, OuterRef, Value
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet as DjoserUserViewSet
 from rest_framework import permissions, serializers, status, viewsets
 from rest_framework.decorators import action, api_view
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
-
+from rest_framework.settings import api_settings
+
+from core.db.utils import insert_ignore
+from core.streaming import stream_csv
+from recipes import relations
+from recipes.changes import get_recipe_changes, get_relation_changes
+from recipes.deletion import delete_recipes, delete_users
+from recipes.export import EXPORTS
+from recipes.feed import get_feed_entries, get_latest_recipes
 from recipes.models import (Favorite, Ingredient, Recipe, ShoppingCart,
                             ShortLinkForRecipe, Tag, User)
+from users.models import Subscription
 
+from .caching import (CompressedResponseCacheMixin, ConditionalGetMixin,
+                      get_response_cache_version)
 from .filters import IngredientFilter, RecipeFilter
-from .pagination import RecipePagination
+from .mixins import (NDJSONStreamMixin, ReplicaReadMixin, SparseFieldsetMixin,
+                     StatementTimeoutMixin)
+from .pagination import (AuthorRecipesPagination, ChangesPagination,
+                         FeedPagination, LimitedOffsetPagination,
+                         RecipePagination)
 from .permissions import IsAuthorReciepOrReadonly
 from .serializers import (AvatarSerializer, IngredientSerializer,
-                          RecipeActionSerializer, RecipeReadSerializer,
-                          RecipeWriteSerializer, ShortLinkSerializer,
+                          RecipeIdsSerializer, RecipeMinInfoSerializer,
+                          RecipeReadSerializer, RecipeWriteSerializer,
+                          ShoppingListItemSerializer, ShortLinkSerializer,
                           SubscribeSerializer, TagSerializer)
 from .shopping_cart import shopping_cart_pdf_generator
 
 
-class UserviewSet(DjoserUserViewSet):
+class UserviewSet(NDJSONStreamMixin, SparseFieldsetMixin, ReplicaReadMixin,
+                  StatementTimeoutMixin, DjoserUserViewSet):
     http_method_names = ['get', 'post', 'put', 'delete']
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitedOffsetPagination
 
     def get_queryset(self):
         user = self.request.user
         queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is not None:
+            queryset = queryset.only('id', *(
+                field.name for field in User._meta.concrete_fields
+                if field.name in fields
+            ))
+            if 'is_subscribed' not in fields:
+                return queryset
         if user.is_authenticated:
-            is_subscribed_subquery = User.objects.filter(
-                subscription=user,
-                id=OuterRef('pk')
+            is_subscribed_subquery = Subscription.objects.filter(
+                from_userprofile=user,
+                to_userprofile=OuterRef('pk')
             )
             queryset = queryset.annotate(
                 is_subscribed=Exists(is_subscribed_subquery)
@@ -46,6 +72,12 @@ class UserviewSet(DjoserUserViewSet):
             )
         return queryset
 
+    def get_instance(self):
+        return User.objects.get(pk=self.request.user.pk)
+
+    def perform_destroy(self, instance):
+        delete_users(User.objects.filter(pk=instance.pk))
+
     @action(detail=False, permission_classes=[permissions.IsAuthenticated])
     def me(self, request):
         serializer = self.get_serializer(self.get_instance())
@@ -68,34 +100,52 @@ class UserviewSet(DjoserUserViewSet):
     def delete_me_avatar(self, request):
         user = self.get_instance()
         if user.avatar:
-            user.avatar.delete()
+            user.avatar = None
+            user.save(update_fields=['avatar'])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def get_authors_queryset(self):
+        return User.objects.annotate(
+            recipes_count=Count('recipes'),
+            is_subscribed=Value(True, output_field=BooleanField()),
+        )
+
     @action(
         detail=True,
         methods=['post'],
         permission_classes=[permissions.IsAuthenticated],
     )
     def subscribe(self, request, id=None):
-        request.data['id'] = id
-        serializer = SubscribeSerializer(
-            data=request.data,
-            context={'request': request}
-        )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        if str(request.user.id) == str(id):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Нельзя подписаться на самого себя'
+                ]
+            })
+        author = get_object_or_404(self.get_authors_queryset(), id=id)
+        if not insert_ignore([
+            Subscription(
+                from_userprofile_id=request.user.id,
+                to_userprofile_id=author.id
+            )
+        ]):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Подписка на выбранного автора уже создана'
+                ]
+            })
+        serializer = SubscribeSerializer(author, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @subscribe.mapping.delete
     def delete_subscribe(self, request, id=None):
-        user = self.get_instance()
-        author = get_object_or_404(User, id=id)
-        del_count, _ = User.subscription.through.objects.filter(
-            from_userprofile_id=user,
-            to_userprofile_id=author
+        del_count, _ = Subscription.objects.filter(
+            from_userprofile_id=request.user.id,
+            to_userprofile_id=id
         ).delete()
         if del_count:
             return Response(status=status.HTTP_204_NO_CONTENT)
+        get_object_or_404(User.objects.only('id'), id=id)
         return Response(
             {"errors": "Подписка на автора не найдена"},
             status=status.HTTP_400_BAD_REQUEST
@@ -105,42 +155,49 @@ class UserviewSet(DjoserUserViewSet):
         detail=False,
         serializer_class=SubscribeSerializer,
         permission_classes=[permissions.IsAuthenticated],
-        pagination_class=LimitOffsetPagination,
+        pagination_class=LimitedOffsetPagination,
     )
     def subscriptions(self, request):
-        user = self.get_instance()
-        queruset = user.subscription.all()
+        queruset = self.get_authors_queryset().filter(
+            userprofile=request.user
+        ).order_by('id')
         page = self.paginate_queryset(queruset)
+        authors = list(queruset) if page is None else page
+        latest_recipes = get_latest_recipes(
+            [author.id for author in authors],
+            AuthorRecipesPagination().get_limit(request),
+            RecipeMinInfoSerializer.Meta.fields,
+        )
+        for author in authors:
+            author.latest_recipes = latest_recipes[author.id]
+        serializer = self.get_serializer(authors, many=True)
 
         if page is not None:
-            serializer = self.get_serializer(
-                page,
-                many=True,
-                context={'request': request},
-            )
             return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(
-            queruset,
-            many=True,
-            context={'request': request},
-        )
         return Response(serializer.data)
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(CompressedResponseCacheMixin, ReplicaReadMixin,
+                 StatementTimeoutMixin, viewsets.ReadOnlyModelViewSet):
+    statement_timeout_scope = 'reference'
+    response_cache_namespace = 'tags'
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(CompressedResponseCacheMixin, ReplicaReadMixin,
+                        StatementTimeoutMixin, viewsets.ReadOnlyModelViewSet):
+    statement_timeout_scope = 'reference'
+    response_cache_namespace = 'ingredients'
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     filter_backends = [IngredientFilter]
     search_fields = ('^name',)
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ConditionalGetMixin, NDJSONStreamMixin,
+                    SparseFieldsetMixin, ReplicaReadMixin,
+                    StatementTimeoutMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthorReciepOrReadonly]
     pagination_class = RecipePagination
     filter_backends = (DjangoFilterBackend,)
@@ -152,45 +209,153 @@ class RecipeViewSet(viewsets.ModelViewSet):
         'is_in_shopping_cart',
     )
 
+    def get_statement_timeout_scope(self):
+        if self.action == 'download_shopping_cart':
+            return 'report'
+        return super().get_statement_timeout_scope()
+
     def get_queryset(self):
         user = self.request.user
-        queryset = Recipe.objects.with_related_data()
+        queryset = Recipe.objects.with_related_data(
+            self.get_requested_fields(), self.get_expanded_fields()
+        )
         if user.is_authenticated:
             return queryset.annotation_relation_with_user(user)
         return queryset.annotate_relation_with_anonymous()
 
+    def is_user_dependent(self):
+        if not self.request.user.is_authenticated:
+            return False
+        fields = self.get_requested_fields()
+        return (
+            fields is None
+            or 'is_favorited' in fields
+            or 'is_in_shopping_cart' in fields
+            or 'is_favorited' in self.request.query_params
+            or 'is_in_shopping_cart' in self.request.query_params
+        )
+
+    def get_conditional_validators(self, request, pk=None):
+        user = request.user
+        user_dependent = self.is_user_dependent()
+        version = [
+            get_response_cache_version(namespace)
+            for namespace in ('tags', 'ingredients', 'users', 'recipes')
+        ]
+        if user_dependent:
+            version.append(user.id)
+        if pk is not None:
+            try:
+                queryset = Recipe.objects.filter(pk=pk)
+            except (TypeError, ValueError, ValidationError):
+                return None
+            fields = ['updated_at']
+            if user_dependent:
+                queryset = queryset.annotation_relation_with_user(user)
+                fields += ['is_favorited', 'is_in_shopping_cart']
+            state = queryset.values_list(*fields).first()
+            if state is None:
+                return None
+            version.append(state)
+            return version, None if user_dependent else state[0]
+        if user_dependent:
+            version.extend(
+                model.objects.filter(user=user).aggregate(
+                    Max('created_at'), Count('id')
+                )
+                for model in (Favorite, ShoppingCart)
+            )
+        return version, None
+
     def get_serializer_class(self):
-        if self.action in ['retrive', 'list']:
+        if self.action in ['retrieve', 'list', 'feed', 'changes']:
             return RecipeReadSerializer
         if self.action in ['favorite', 'shopping_cart']:
-            return RecipeActionSerializer
+            return RecipeMinInfoSerializer
         return RecipeWriteSerializer
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-    def action_create_for_reicpe(self, request, pk, model):
-        recipe = get_object_or_404(self.get_queryset(), id=pk)
-        request.data['id'] = recipe.id
-        serializer = self.get_serializer(
-            data=request.data,
-            context={'request': request}
+    def perform_destroy(self, instance):
+        delete_recipes(Recipe.objects.filter(pk=instance.pk))
+
+    def action_create_for_reicpe(self, request, pk, service):
+        recipe = get_object_or_404(
+            Recipe.objects.only(*RecipeMinInfoSerializer.Meta.fields),
+            id=pk
         )
-        serializer.Meta.model = model
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        if not service.add(request.user, recipe.id):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Нельзя дважды добавить выбранный рецепт'
+                ]
+            })
+        serializer = self.get_serializer(recipe)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    def action_delete_for_recipe(self, request, pk, model):
-        recipe = get_object_or_404(self.get_queryset(), id=pk)
-        if not model.objects.filter(
-            recipe=recipe, user=request.user
-        ).exists():
-            raise serializers.ValidationError(
-                {'error': 'Рецепт не найден'}
+    def action_delete_for_recipe(self, request, pk, service):
+        if service.remove(request.user, pk):
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        get_object_or_404(Recipe.objects.only('id'), id=pk)
+        raise serializers.ValidationError(
+            {'error': 'Рецепт не найден'}
+        )
+
+    def get_bulk_recipe_ids(self, request, required=True):
+        if not required and 'ids' not in request.data:
+            return None
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return list(dict.fromkeys(serializer.validated_data['ids']))
+
+    def bulk_create_for_recipes(self, request, service):
+        recipe_ids = self.get_bulk_recipe_ids(request)
+        found_ids = Recipe.objects.only('id').in_bulk(recipe_ids).keys()
+        added_ids = set(
+            service.add_many(
+                request.user,
+                [recipe_id for recipe_id in recipe_ids
+                 if recipe_id in found_ids]
             )
-        model.objects.filter(recipe=pk, user=request.user).delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        )
+        results = []
+        for recipe_id in recipe_ids:
+            if recipe_id not in found_ids:
+                outcome = 'not_found'
+            elif recipe_id in added_ids:
+                outcome = 'added'
+            else:
+                outcome = 'exists'
+            results.append({'id': recipe_id, 'status': outcome})
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    def bulk_delete_for_recipes(self, request, service):
+        recipe_ids = self.get_bulk_recipe_ids(request, required=False)
+        removed_ids = service.remove_many(request.user, recipe_ids)
+        if recipe_ids is None:
+            results = [
+                {'id': recipe_id, 'status': 'removed'}
+                for recipe_id in removed_ids
+            ]
+            return Response({'results': results}, status=status.HTTP_200_OK)
+        removed_ids = set(removed_ids)
+        found_ids = Recipe.objects.only('id').in_bulk(
+            [
+                recipe_id for recipe_id in recipe_ids
+                if recipe_id not in removed_ids
+            ]
+        ).keys()
+        results = []
+        for recipe_id in recipe_ids:
+            if recipe_id in removed_ids:
+                outcome = 'removed'
+            elif recipe_id in found_ids:
+                outcome = 'absent'
+            else:
+                outcome = 'not_found'
+            results.append({'id': recipe_id, 'status': outcome})
+        return Response({'results': results}, status=status.HTTP_200_OK)
 
     @action(
         detail=True,
@@ -199,11 +364,51 @@ class RecipeViewSet(viewsets.ModelViewSet):
         pagination_class=RecipePagination
     )
     def favorite(self, request, pk=None):
-        return self.action_create_for_reicpe(request, pk, Favorite)
+        return self.action_create_for_reicpe(request, pk, relations.favorites)
 
     @favorite.mapping.delete
     def delete_favorite(self, request, pk=None):
-        return self.action_delete_for_recipe(request, pk, Favorite)
+        return self.action_delete_for_recipe(request, pk, relations.favorites)
+
+    def relation_changes(self, request, service):
+        paginator = self.paginator
+        limit = paginator.get_limit(request)
+        entries = paginator.paginate_entries(
+            get_relation_changes(
+                service,
+                request.user,
+                paginator.get_position(request),
+                limit
+            ),
+            limit,
+            request
+        )
+        return paginator.get_paginated_response([
+            {'id': recipe_id, 'deleted': deleted, 'changed_at': changed_at}
+            for changed_at, recipe_id, deleted in entries
+        ])
+
+    @action(
+        detail=False,
+        methods=['post'],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path='favorite/bulk',
+    )
+    def favorite_bulk(self, request):
+        return self.bulk_create_for_recipes(request, relations.favorites)
+
+    @favorite_bulk.mapping.delete
+    def delete_favorite_bulk(self, request):
+        return self.bulk_delete_for_recipes(request, relations.favorites)
+
+    @action(
+        detail=False,
+        permission_classes=[permissions.IsAuthenticated],
+        pagination_class=ChangesPagination,
+        url_path='favorite/changes',
+    )
+    def favorite_changes(self, request):
+        return self.relation_changes(request, relations.favorites)
 
     @action(
         detail=True,
@@ -211,17 +416,132 @@ class RecipeViewSet(viewsets.ModelViewSet):
         permission_classes=[permissions.IsAuthenticated],
     )
     def shopping_cart(self, request, pk=None):
-        return self.action_create_for_reicpe(request, pk, ShoppingCart)
+        return self.action_create_for_reicpe(
+            request, pk, relations.shopping_cart
+        )
 
     @shopping_cart.mapping.delete
     def delete_shopping_cart(self, request, pk=None):
-        return self.action_delete_for_recipe(request, pk, ShoppingCart)
+        return self.action_delete_for_recipe(
+            request, pk, relations.shopping_cart
+        )
+
+    @action(
+        detail=False,
+        methods=['post'],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path='shopping_cart/bulk',
+    )
+    def shopping_cart_bulk(self, request):
+        return self.bulk_create_for_recipes(request, relations.shopping_cart)
+
+    @shopping_cart_bulk.mapping.delete
+    def delete_shopping_cart_bulk(self, request):
+        return self.bulk_delete_for_recipes(request, relations.shopping_cart)
+
+    @action(
+        detail=False,
+        permission_classes=[permissions.IsAuthenticated],
+        pagination_class=ChangesPagination,
+        url_path='shopping_cart/changes',
+    )
+    def shopping_cart_changes(self, request):
+        return self.relation_changes(request, relations.shopping_cart)
+
+    @action(detail=False, pagination_class=ChangesPagination)
+    def changes(self, request):
+        paginator = self.paginator
+        limit = paginator.get_limit(request)
+        entries = paginator.paginate_entries(
+            get_recipe_changes(paginator.get_position(request), limit),
+            limit,
+            request
+        )
+        recipes = self.get_queryset().in_bulk(
+            [recipe_id for _, recipe_id, deleted in entries if not deleted]
+        )
+        serializer = self.get_serializer(list(recipes.values()), many=True)
+        recipes_data = dict(zip(recipes, serializer.data))
+        results = []
+        for changed_at, recipe_id, deleted in entries:
+            result = {
+                'id': recipe_id,
+                'deleted': deleted,
+                'changed_at': changed_at,
+            }
+            if not deleted:
+                if recipe_id not in recipes_data:
+                    continue
+                result['recipe'] = recipes_data[recipe_id]
+            results.append(result)
+        return paginator.get_paginated_response(results)
+
+    @action(
+        detail=False,
+        permission_classes=[permissions.IsAuthenticated],
+        pagination_class=FeedPagination,
+    )
+    def feed(self, request):
+        paginator = self.paginator
+        limit = paginator.get_limit(request)
+        entries = paginator.paginate_entries(
+            get_feed_entries(
+                request.user,
+                paginator.get_position(request),
+                limit + 1
+            ),
+            limit,
+            request
+        )
+        recipes = self.get_queryset().in_bulk(
+            [recipe_id for recipe_id, _ in entries]
+        )
+        serializer = self.get_serializer(
+            [
+                recipes[recipe_id]
+                for recipe_id, _ in entries
+                if recipe_id in recipes
+            ],
+            many=True,
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        serializer_class=ShoppingListItemSerializer,
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def shopping_list(self, request):
+        serializer = ShoppingListItemSerializer(
+            request.user.shopping_list.select_related(
+                'ingredient'
+            ).order_by('ingredient__name'),
+            many=True,
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=False, permission_classes=[permissions.IsAuthenticated])
     def download_shopping_cart(self, request):
         response = shopping_cart_pdf_generator(request.user)
         return response
 
+    @action(detail=True, serializer_class=RecipeMinInfoSerializer)
+    def similar(self, request, pk=None):
+        try:
+            recipes = list(
+                Recipe.objects.filter(similar_to__recipe_id=pk).order_by(
+                    'similar_to__rank'
+                ).only(*RecipeMinInfoSerializer.Meta.fields)
+            )
+        except (TypeError, ValueError):
+            raise Http404
+        if not recipes:
+            get_object_or_404(Recipe.objects.only('id'), id=pk)
+        serializer = RecipeMinInfoSerializer(
+            recipes, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
     @action(
         detail=True,
         url_path='get-link',
@@ -241,6 +561,19 @@ class RecipeViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class ExportViewSet(ReplicaReadMixin, viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+
+    def list(self, request):
+        return Response(sorted(EXPORTS), status=status.HTTP_200_OK)
+
+    def retrieve(self, request, pk=None):
+        if pk not in EXPORTS:
+            raise Http404
+        model, fields = EXPORTS[pk]
+        return stream_csv(model.objects.all(), fields, f'{pk}.csv')
+
+
 @api_view(['GET'])
 def redirect_to_recipe(request, short_url):
     obj = get_object_or_404(ShortLinkForRecipe, short_url=short_url)
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .db.deletion import bulk_delete, count_related
+from .db.utils import get_estimated_count
+from .streaming import stream_csv
+
+
+class EstimatedCountPaginator(Paginator):
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by().values('pk')
+        if connections[queryset.db].vendor == 'postgresql':
+            estimate = get_estimated_count(queryset)
+            if estimate > settings.ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+        return queryset.count()
+
+
+class LargeTableAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    list_max_show_all = 200
+
+
+class CsvExportAdminMixin:
+    actions = ('export_csv',)
+    export_fields = ()
+
+    def export_csv(self, request, queryset):
+        return stream_csv(
+            queryset,
+            self.export_fields or [
+                field.attname for field in self.model._meta.concrete_fields
+            ],
+            f'{self.model._meta.model_name}.csv',
+        )
+
+    export_csv.short_description = 'Выгрузить выбранные в CSV'
+
+
+class BulkDeleteAdminMixin:
+
+    def delete_objects(self, queryset):
+        return bulk_delete(
+            queryset, batch_size=settings.BULK_DELETE_BATCH_SIZE
+        )
+
+    def delete_model(self, request, obj):
+        self.delete_objects(self.model._default_manager.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        self.delete_objects(queryset)
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        counts = count_related(self.model._default_manager.filter(
+            pk__in=[obj.pk for obj in objs]
+        ))
+        counts[self.model] = len(objs)
+        perms_needed = set()
+        for model in counts:
+            model_admin = self.admin_site._registry.get(model)
+            if model_admin and not model_admin.has_delete_permission(request):
+                perms_needed.add(model._meta.verbose_name)
+        model_count = {
+            model._meta.verbose_name_plural: count
+            for model, count in counts.items()
+        }
+        return [str(obj) for obj in objs], model_count, perms_needed, []
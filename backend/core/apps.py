@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+        from .bus import start_invalidation_bus
+        from .db.routers import check_replica_cache
+
+        check_replica_cache()
+        request_started.connect(start_invalidation_bus)
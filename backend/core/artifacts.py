@@ -0,0 +1,54 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+
+
+def get_artifact_path(name):
+    return Path(settings.ARTIFACTS_ROOT) / name
+
+
+def artifact_exists(name):
+    return name is not None and get_artifact_path(name).is_file()
+
+
+def store_artifact(content, suffix=''):
+    digest = hashlib.sha256(content).hexdigest()
+    name = f'{digest[:2]}/{digest[2:4]}/{digest}{suffix}'
+    path = get_artifact_path(name)
+    if path.is_file():
+        os.utime(path)
+        return name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(descriptor, 'wb') as temp_file:
+            temp_file.write(content)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return name
+
+
+def artifact_response(name, filename, content_type):
+    if not settings.ARTIFACTS_X_ACCEL_REDIRECT:
+        return FileResponse(
+            open(get_artifact_path(name), 'rb'),
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+    response = HttpResponse(content_type=content_type)
+    response['X-Accel-Redirect'] = quote(
+        settings.ARTIFACTS_ACCEL_PREFIX + name
+    )
+    response['Content-Disposition'] = 'attachment; filename="{}"'.format(
+        filename
+    )
+    return response
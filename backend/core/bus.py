@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import select
+import threading
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+
+from .models import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidationBus:
+
+    def __init__(self):
+        self.versions = {}
+        self.subscribers = {}
+        self.lock = threading.Lock()
+        self.start_lock = threading.Lock()
+        self.thread = None
+        self.thread_pid = None
+        self.stopped = threading.Event()
+
+    def subscribe(self, channel, callback):
+        with self.lock:
+            self.subscribers.setdefault(channel, []).append(callback)
+
+    def get_version(self, channel):
+        self.ensure_started()
+        return self.versions.get(channel, 0)
+
+    def publish(self, channel, keys=None):
+        using = router.db_for_write(CacheVersion)
+        transaction.on_commit(
+            lambda: self.send(channel, keys, using), using=using
+        )
+
+    def send(self, channel, keys, using):
+        with transaction.atomic(using=using):
+            versions = CacheVersion.objects.using(using).filter(
+                channel=channel
+            )
+            if not versions.update(version=F('version') + 1):
+                CacheVersion.objects.using(using).get_or_create(
+                    channel=channel
+                )
+                versions.update(version=F('version') + 1)
+            version = versions.values_list('version', flat=True).get()
+            connection = connections[using]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT pg_notify(%s, %s)',
+                        [
+                            settings.CACHE_BUS['CHANNEL'],
+                            json.dumps([channel, version, keys]),
+                        ]
+                    )
+        self.apply(channel, version, keys)
+        return version
+
+    def apply(self, channel, version, keys=None):
+        with self.lock:
+            current_version = self.versions.get(channel, 0)
+            if version <= current_version:
+                return
+            if version != current_version + 1:
+                keys = None
+            self.versions[channel] = version
+            callbacks = list(self.subscribers.get(channel, ()))
+        for callback in callbacks:
+            callback(channel, version, keys)
+
+    def sync(self):
+        using = router.db_for_read(CacheVersion) or 'default'
+        for channel, version in CacheVersion.objects.using(
+            using
+        ).values_list('channel', 'version'):
+            self.apply(channel, version)
+
+    def is_running(self):
+        return (
+            self.thread_pid == os.getpid()
+            and self.thread is not None
+            and self.thread.is_alive()
+        )
+
+    def ensure_started(self):
+        if not settings.CACHE_BUS['ENABLED'] or self.is_running():
+            return
+        with self.start_lock:
+            if self.is_running():
+                return
+            self.stopped.clear()
+            self.sync()
+            self.thread = threading.Thread(
+                target=self.run, name='cache-invalidation-bus', daemon=True
+            )
+            self.thread.start()
+            self.thread_pid = os.getpid()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                if connections['default'].vendor == 'postgresql':
+                    self.listen()
+                else:
+                    self.sync()
+                    self.stopped.wait(settings.CACHE_BUS['POLL_INTERVAL'])
+            except Exception:
+                logger.exception('Cache invalidation bus failed')
+                self.stopped.wait(settings.CACHE_BUS['POLL_INTERVAL'])
+            finally:
+                connections.close_all()
+
+    def listen(self):
+        import psycopg2
+
+        connection = connections['default']
+        listener = psycopg2.connect(**connection.get_connection_params())
+        try:
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute(
+                    'LISTEN ' + connection.ops.quote_name(
+                        settings.CACHE_BUS['CHANNEL']
+                    )
+                )
+            self.sync()
+            connections.close_all()
+            while not self.stopped.is_set():
+                readable, _, _ = select.select(
+                    [listener], [], [], settings.CACHE_BUS['SYNC_INTERVAL']
+                )
+                if not readable:
+                    self.sync()
+                    connections.close_all()
+                    continue
+                listener.poll()
+                while listener.notifies:
+                    notify = listener.notifies.pop(0)
+                    self.apply(*json.loads(notify.payload))
+        finally:
+            listener.close()
+
+
+bus = InvalidationBus()
+
+
+def start_invalidation_bus(**kwargs):
+    bus.ensure_started()
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .cache import is_shared_cache
+
+
+@register()
+def check_render_pool_cache(app_configs, **kwargs):
+    if is_shared_cache(settings.PDF_RENDER_POOL['CACHE']):
+        return []
+    return [Warning(
+        'Лимит PDF_RENDER_POOL MAX_PER_USER считается отдельно '
+        'в каждом процессе',
+        hint='Задайте общий кеш через CACHE_BACKEND и CACHE_LOCATION',
+        id='core.W001',
+    )]
@@ -0,0 +1,128 @@
+import queue
+import threading
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+_pools = {}
+_pools_lock = threading.Lock()
+UNKNOWN = object()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    statement_timeout = None
+    applied_statement_timeout = None
+    health_check_done = False
+
+    @property
+    def pool(self):
+        pool_size = self.settings_dict.get('POOL_SIZE')
+        if not pool_size:
+            return None
+        with _pools_lock:
+            if self.alias not in _pools:
+                _pools[self.alias] = queue.LifoQueue(maxsize=pool_size)
+            return _pools[self.alias]
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        while pool is not None:
+            try:
+                connection = pool.get_nowait()
+            except queue.Empty:
+                break
+            if self.is_pooled_connection_usable(connection):
+                return connection
+        return super().get_new_connection(conn_params)
+
+    def is_pooled_connection_usable(self, connection):
+        if connection.closed:
+            return False
+        if not self.settings_dict.get('CONN_HEALTH_CHECKS'):
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except base.Database.Error:
+            connection.close()
+            return False
+        return True
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def init_connection_state(self):
+        super().init_connection_state()
+        self.applied_statement_timeout = None
+
+    def create_cursor(self, name=None):
+        self.apply_statement_timeout()
+        return super().create_cursor(name)
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
+
+    def _rollback(self):
+        super()._rollback()
+        self.applied_statement_timeout = UNKNOWN
+
+    def _savepoint_rollback(self, sid):
+        super()._savepoint_rollback(sid)
+        self.applied_statement_timeout = UNKNOWN
+
+    def _close(self):
+        if self.connection is not None and self.return_to_pool():
+            return
+        super()._close()
+
+    def return_to_pool(self):
+        pool = self.pool
+        if (
+            pool is None
+            or self.connection.closed
+            or not self.connection.autocommit
+            or self.connection.get_transaction_status()
+            != extensions.TRANSACTION_STATUS_IDLE
+        ):
+            return False
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute('RESET ALL')
+            pool.put_nowait(self.connection)
+        except (queue.Full, base.Database.Error):
+            return False
+        return True
+
+    def close_if_unusable_or_obsolete(self):
+        self.health_check_done = False
+        super().close_if_unusable_or_obsolete()
+
+    def close_if_health_check_failed(self):
+        while not (
+            self.connection is None
+            or self.health_check_done
+            or self.in_atomic_block
+            or not self.settings_dict.get('CONN_HEALTH_CHECKS')
+        ):
+            self.health_check_done = True
+            if not self.is_usable():
+                self.close()
+                self.ensure_connection()
+
+    def set_statement_timeout(self, timeout):
+        self.statement_timeout = timeout
+
+    def apply_statement_timeout(self):
+        if self.statement_timeout == self.applied_statement_timeout:
+            return
+        with self.connection.cursor() as cursor:
+            if self.statement_timeout is None:
+                cursor.execute('RESET statement_timeout')
+            else:
+                cursor.execute(
+                    'SET statement_timeout = %s',
+                    [int(self.statement_timeout)]
+                )
+        self.applied_statement_timeout = self.statement_timeout
@@ -0,0 +1,132 @@
+from collections import Counter
+
+from django.db import router, transaction
+from django.db.models import CASCADE, DO_NOTHING, SET_NULL, signals
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+SUPPORTED_ON_DELETE = (CASCADE, SET_NULL, DO_NOTHING)
+
+
+def get_relations(model):
+    return [
+        relation
+        for relation in get_candidate_relations_to_delete(model._meta)
+        if relation.on_delete is not DO_NOTHING
+    ]
+
+
+def supports_bulk_delete(model, seen=None):
+    seen = set() if seen is None else seen
+    if model in seen:
+        return True
+    seen.add(model)
+    if model._meta.parents or any(
+        hasattr(field, 'bulk_related_objects')
+        for field in model._meta.private_fields
+    ):
+        return False
+    for relation in get_relations(model):
+        if relation.on_delete not in SUPPORTED_ON_DELETE:
+            return False
+        if relation.on_delete is CASCADE and not supports_bulk_delete(
+            relation.related_model, seen
+        ):
+            return False
+    return True
+
+
+def has_delete_listeners(model):
+    return (
+        signals.pre_delete.has_listeners(model)
+        or signals.post_delete.has_listeners(model)
+    )
+
+
+def iter_pk_batches(queryset, batch_size):
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    last_pk = None
+    while True:
+        batch = queryset
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        pks = list(batch[:batch_size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def delete_batch(model, pks, using, silent_models=(), batch_size=1000):
+    deleted = Counter()
+    instances = []
+    if model not in silent_models and has_delete_listeners(model):
+        instances = list(model._base_manager.using(using).filter(pk__in=pks))
+        for instance in instances:
+            signals.pre_delete.send(
+                sender=model, instance=instance, using=using
+            )
+    for relation in get_relations(model):
+        field = relation.field
+        related = relation.related_model._base_manager.using(using).filter(
+            **{f'{field.name}__in': pks}
+        )
+        if relation.on_delete is SET_NULL:
+            related.update(**{field.name: None})
+        else:
+            deleted += delete_related(
+                related, using, silent_models, batch_size
+            )
+    count = model._base_manager.using(using).filter(pk__in=pks)._raw_delete(
+        using
+    )
+    if count:
+        deleted[model._meta.label] += count
+    for instance in instances:
+        signals.post_delete.send(sender=model, instance=instance, using=using)
+        setattr(instance, model._meta.pk.attname, None)
+    return deleted
+
+
+def delete_related(queryset, using, silent_models, batch_size):
+    model = queryset.model
+    if not get_relations(model) and (
+        model in silent_models or not has_delete_listeners(model)
+    ):
+        deleted = Counter()
+        count = queryset._raw_delete(using)
+        if count:
+            deleted[model._meta.label] = count
+        return deleted
+    deleted = Counter()
+    for pks in iter_pk_batches(queryset, batch_size):
+        deleted += delete_batch(model, pks, using, silent_models, batch_size)
+    return deleted
+
+
+def count_related(queryset, counts=None):
+    counts = Counter() if counts is None else counts
+    for relation in get_relations(queryset.model):
+        if relation.on_delete is not CASCADE:
+            continue
+        related = relation.related_model._base_manager.using(
+            queryset.db
+        ).filter(**{f'{relation.field.name}__in': queryset.values('pk')})
+        count = related.count()
+        if count:
+            counts[related.model] += count
+            count_related(related, counts)
+    return counts
+
+
+def bulk_delete(queryset, silent_models=(), batch_size=1000):
+    model = queryset.model
+    if not supports_bulk_delete(model):
+        return queryset.delete()
+    using = router.db_for_write(model)
+    deleted = Counter()
+    for pks in iter_pk_batches(queryset.using(using), batch_size):
+        with transaction.atomic(using=using):
+            deleted += delete_batch(
+                model, pks, using, silent_models, batch_size
+            )
+    return sum(deleted.values()), dict(deleted)
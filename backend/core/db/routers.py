@@ -0,0 +1,61 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+
+from core.cache import is_shared_cache
+
+PIN_CACHE_KEY = 'db-primary-pin-{}'
+CACHE_APP_LABEL = 'django_cache'
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def check_replica_cache():
+    if settings.DATABASE_REPLICAS and not is_shared_cache():
+        raise ImproperlyConfigured(
+            'Для чтения с реплик нужен общий для всех процессов кеш: '
+            'задайте CACHE_BACKEND и CACHE_LOCATION'
+        )
+
+
+def route_reads_to_replica():
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return _read_alias.set(random.choice(settings.DATABASE_REPLICAS))
+
+
+def reset_read_routing(token):
+    _read_alias.reset(token)
+
+
+def pin_user_to_primary(user):
+    cache.set(
+        PIN_CACHE_KEY.format(user.pk),
+        True,
+        settings.REPLICA_PIN_SECONDS
+    )
+
+
+def is_user_pinned_to_primary(user):
+    return cache.get(PIN_CACHE_KEY.format(user.pk), False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
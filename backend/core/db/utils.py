@@ -0,0 +1,88 @@
+import json
+from itertools import islice
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, router
+from django.db.models import prefetch_related_objects
+
+
+def set_statement_timeout(timeout):
+    for connection in connections.all():
+        if hasattr(connection, 'set_statement_timeout'):
+            connection.set_statement_timeout(timeout)
+
+
+def insert_ignore(instances, returning=None):
+    if not instances:
+        return [] if returning else 0
+    model = type(instances[0])
+    connection = connections[router.db_for_write(model)]
+    quote_name = connection.ops.quote_name
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    row_sql = '({})'.format(', '.join(['%s'] * len(fields)))
+    sql = 'INSERT INTO {} ({}) VALUES {} ON CONFLICT DO NOTHING'.format(
+        quote_name(model._meta.db_table),
+        ', '.join(quote_name(field.column) for field in fields),
+        ', '.join([row_sql] * len(instances)),
+    )
+    params = [
+        field.get_db_prep_save(field.pre_save(instance, True), connection)
+        for instance in instances
+        for field in fields
+    ]
+    with connection.cursor() as cursor:
+        if returning is None:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+        column = model._meta.get_field(returning).column
+        cursor.execute(f'{sql} RETURNING {quote_name(column)}', params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def delete_returning(queryset, returning):
+    model = queryset.model
+    using = router.db_for_write(model)
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    try:
+        where, params = queryset.query.get_compiler(using).compile(
+            queryset.query.where
+        )
+    except EmptyResultSet:
+        return []
+    sql = 'DELETE FROM {} WHERE {} RETURNING {}'.format(
+        quote_name(model._meta.db_table),
+        where,
+        quote_name(model._meta.get_field(returning).column),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def get_estimated_count(queryset):
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def iterate_in_chunks(queryset, chunk_size):
+    lookups = queryset._prefetch_related_lookups
+    iterator = queryset.prefetch_related(None).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        if lookups:
+            prefetch_related_objects(chunk, *lookups)
+        yield chunk
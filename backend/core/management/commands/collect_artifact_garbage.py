@@ -0,0 +1,57 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from .collect_media_garbage import iter_media_files
+
+
+def remove_empty_directories(root):
+    for path, directories, files in os.walk(root, topdown=False):
+        if path != root and not directories and not files:
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+
+
+class Command(BaseCommand):
+    help = 'Удаляет из ARTIFACTS_ROOT устаревшие сгенерированные файлы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=settings.ARTIFACTS_MAX_AGE,
+            help='Удалять файлы старше указанного числа секунд',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, какие файлы будут удалены',
+        )
+
+    def handle(self, *args, **options):
+        root = settings.ARTIFACTS_ROOT
+        if not os.path.isdir(root):
+            self.stdout.write('Каталог ARTIFACTS_ROOT не найден')
+            return
+        deadline = time.time() - options['max_age']
+        removed = 0
+        for entry in iter_media_files(root):
+            if entry.stat().st_mtime > deadline:
+                continue
+            removed += 1
+            if options['dry_run']:
+                self.stdout.write(os.path.relpath(entry.path, root))
+                continue
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+        if not options['dry_run']:
+            remove_empty_directories(root)
+        self.stdout.write(self.style.SUCCESS(
+            f'Устаревших файлов: {removed}'
+        ))
@@ -0,0 +1,76 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.storage import delete_unreferenced_files, get_referenced_names
+
+
+def iter_media_files(root):
+    directories = [root]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+class Command(BaseCommand):
+    help = 'Удаляет из MEDIA_ROOT файлы, на которые нет ссылок в базе'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Количество файлов, проверяемых за один запрос',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=settings.MEDIA_GC_MIN_AGE,
+            help='Не трогать файлы моложе указанного числа секунд',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, какие файлы будут удалены',
+        )
+
+    def handle(self, *args, **options):
+        root = settings.MEDIA_ROOT
+        if not os.path.isdir(root):
+            self.stdout.write('Каталог MEDIA_ROOT не найден')
+            return
+        deadline = time.time() - options['min_age']
+        batch = []
+        checked = 0
+        removed = 0
+        for entry in iter_media_files(root):
+            if entry.stat().st_mtime > deadline:
+                continue
+            batch.append(
+                os.path.relpath(entry.path, root).replace(os.sep, '/')
+            )
+            if len(batch) >= options['batch_size']:
+                checked += len(batch)
+                removed += self.remove(batch, deadline, options['dry_run'])
+                batch = []
+        checked += len(batch)
+        removed += self.remove(batch, deadline, options['dry_run'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено файлов: {checked}, без ссылок: {removed}'
+        ))
+
+    def remove(self, names, deadline, dry_run):
+        if not names:
+            return 0
+        unreferenced = sorted(set(names) - get_referenced_names(names))
+        if dry_run:
+            for name in unreferenced:
+                self.stdout.write(name)
+            return len(unreferenced)
+        return len(delete_unreferenced_files(unreferenced, deadline))
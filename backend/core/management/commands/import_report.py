@@ -0,0 +1,90 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_TIME_PREFIX = 'import time:'
+
+
+def measure_imports(modules):
+    script = '; '.join([
+        'import django',
+        'django.setup()',
+        *(f'import {module}' for module in modules),
+    ])
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        capture_output=True,
+        cwd=settings.BASE_DIR,
+        text=True,
+    )
+    if result.returncode:
+        raise CommandError([
+            line for line in result.stderr.splitlines()
+            if line and not line.startswith(IMPORT_TIME_PREFIX)
+        ][-1])
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        own, cumulative, name = line[len(IMPORT_TIME_PREFIX):].split('|')
+        if not own.strip().isdigit():
+            continue
+        timings.append((
+            name.strip(),
+            int(own) / 1000,
+            int(cumulative) / 1000,
+            len(name) - len(name.lstrip()),
+        ))
+    return timings
+
+
+class Command(BaseCommand):
+    help = ('Показывает самые долгие импорты при старте приложения '
+            '(python -X importtime)')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'modules',
+            nargs='*',
+            help='Импортируемые модули, по умолчанию ROOT_URLCONF',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=30,
+            help='Количество строк в отчёте',
+        )
+        parser.add_argument(
+            '--top-level',
+            action='store_true',
+            help='Показывать только модули, импортированные напрямую',
+        )
+        parser.add_argument(
+            '--sort',
+            choices=('cumulative', 'self'),
+            default='cumulative',
+            help='Сортировать по общему или собственному времени',
+        )
+
+    def handle(self, *args, **options):
+        timings = measure_imports(
+            options['modules'] or [settings.ROOT_URLCONF]
+        )
+        total = sum(own for _, own, _, _ in timings)
+        count = len(timings)
+        if options['top_level']:
+            minimal_depth = min(depth for *_, depth in timings)
+            timings = [
+                timing for timing in timings if timing[3] == minimal_depth
+            ]
+        key = 2 if options['sort'] == 'cumulative' else 1
+        timings.sort(key=lambda timing: timing[key], reverse=True)
+        self.stdout.write(f'{"общее, мс":>12} {"своё, мс":>10}  модуль')
+        for name, own, cumulative, _ in timings[:options['limit']]:
+            self.stdout.write(f'{cumulative:12.1f} {own:10.1f}  {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано модулей: {count}, '
+            f'общее время импорта: {total:.1f} мс'
+        ))
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+
+class Command(BaseCommand):
+    help = 'Периодически запускает команды обслуживания из PERIODIC_TASKS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Запустить каждую команду один раз и завершиться',
+        )
+
+    def handle(self, *args, **options):
+        next_runs = [0] * len(settings.PERIODIC_TASKS)
+        while True:
+            now = time.monotonic()
+            for index, (name, arguments, interval) in enumerate(
+                settings.PERIODIC_TASKS
+            ):
+                if next_runs[index] > now:
+                    continue
+                next_runs[index] = now + interval
+                self.run(name, arguments)
+            if options['once']:
+                return
+            time.sleep(max(0, min(next_runs) - time.monotonic()))
+
+    def run(self, name, arguments):
+        close_old_connections()
+        try:
+            call_command(name, *arguments, stdout=self.stdout)
+        except Exception as error:
+            self.stderr.write(f'{name}: {error!r}')
+        finally:
+            close_old_connections()
@@ -8,6 +8,7 @@ class UserRecipeRelation(models.Model):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name='%(class)s_user',
         verbose_name='Пользователь',
     )
@@ -17,12 +18,52 @@ class UserRecipeRelation(models.Model):
         related_name='%(class)s_recipes',
         verbose_name='Рецепт',
     )
+    created_at = models.DateTimeField(
+        'Дата добавления',
+        auto_now_add=True,
+    )
 
     class Meta:
         abstract = True
+        indexes = [
+            models.Index(
+                fields=['user', 'created_at', 'recipe'],
+                name='%(class)s_user_created_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
-                fields=['recipe', 'user'],
+                fields=['user', 'recipe'],
                 name='unique_user_recipe_%(class)s'
             )
         ]
+
+
+class UserRecipeRelationTombstone(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Пользователь',
+    )
+    recipe_id = models.BigIntegerField(verbose_name='Рецепт')
+    deleted_at = models.DateTimeField('Дата удаления', auto_now_add=True)
+
+    class Meta:
+        abstract = True
+
+
+class CacheVersion(models.Model):
+    channel = models.CharField(
+        'Канал инвалидации',
+        max_length=64,
+        unique=True,
+    )
+    version = models.BigIntegerField('Версия', default=0)
+
+    class Meta:
+        verbose_name = 'Версия кеша'
+        verbose_name_plural = 'Версии кешей'
+
+    def __str__(self):
+        return f'{self.channel}: {self.version}'
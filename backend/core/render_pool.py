@@ -0,0 +1,128 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from asgiref.sync import sync_to_async
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+USER_SLOTS_CACHE_KEY = 'render-pool:{}:user:{}'
+
+
+class RenderPoolBusy(Exception):
+
+    def __init__(self, retry_after):
+        super().__init__(f'Render pool is busy, retry after {retry_after}s')
+        self.retry_after = retry_after
+
+
+class RenderPool:
+
+    def __init__(self, name, workers, max_pending, max_per_user, timeout,
+                 retry_after, start_method='spawn',
+                 cache_alias=DEFAULT_CACHE_ALIAS):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_per_user = max_per_user
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.start_method = start_method
+        self.cache_alias = cache_alias
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.executor = None
+        self.executor_pid = None
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None or self.executor_pid != os.getpid():
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(
+                        self.start_method
+                    ),
+                )
+                self.executor_pid = os.getpid()
+            return self.executor
+
+    def reset_executor(self, executor):
+        with self.lock:
+            if self.executor is executor:
+                self.executor = None
+        executor.shutdown(wait=False)
+
+    def get_user_slots_key(self, user_id):
+        return USER_SLOTS_CACHE_KEY.format(self.name, user_id)
+
+    def acquire(self, user_id):
+        with self.lock:
+            if self.pending >= self.max_pending:
+                raise RenderPoolBusy(self.retry_after)
+            self.pending += 1
+        cache = caches[self.cache_alias]
+        key = self.get_user_slots_key(user_id)
+        cache.add(key, 0, self.timeout + self.retry_after)
+        try:
+            slots = cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, self.timeout + self.retry_after)
+            slots = 1
+        if slots > self.max_per_user:
+            self.release(user_id)
+            raise RenderPoolBusy(self.retry_after)
+
+    def release(self, user_id):
+        with self.lock:
+            self.pending -= 1
+        try:
+            caches[self.cache_alias].decr(self.get_user_slots_key(user_id))
+        except ValueError:
+            pass
+
+    def submit(self, user_id, function, *args):
+        self.acquire(user_id)
+        executor = self.get_executor()
+        try:
+            future = executor.submit(function, *args)
+        except BrokenProcessPool:
+            self.release(user_id)
+            self.reset_executor(executor)
+            raise
+        except BaseException:
+            self.release(user_id)
+            raise
+        future.add_done_callback(
+            lambda future: self.finish(executor, future, user_id)
+        )
+        return future
+
+    def finish(self, executor, future, user_id):
+        self.release(user_id)
+        if not future.cancelled() and isinstance(
+            future.exception(), BrokenProcessPool
+        ):
+            self.reset_executor(executor)
+
+    def run(self, user_id, function, *args):
+        future = self.submit(user_id, function, *args)
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise RenderPoolBusy(self.retry_after)
+
+    async def run_async(self, user_id, function, *args):
+        future = await sync_to_async(self.submit, thread_sensitive=False)(
+            user_id, function, *args
+        )
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout
+            )
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise RenderPoolBusy(self.retry_after)
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import connections, transaction
+from django.db.models import FileField
+
+removal_executors = {}
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(directory, digest[:2], f'{digest}{extension}')
+
+    def _save(self, name, content):
+        name = self.get_content_name(name, content)
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return super()._save(name, content)
+
+
+def get_referenced_names(names):
+    referenced = set()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField):
+                referenced.update(model._default_manager.filter(
+                    **{f'{field.name}__in': names}
+                ).values_list(field.name, flat=True))
+    return referenced
+
+
+def delete_unreferenced_files(names, deadline):
+    removed = []
+    for name in sorted(set(names) - get_referenced_names(names)):
+        try:
+            modified = default_storage.get_modified_time(name)
+        except OSError:
+            continue
+        if modified.timestamp() <= deadline:
+            default_storage.delete(name)
+            removed.append(name)
+    return removed
+
+
+def remove_unreferenced_files(names, min_age):
+    try:
+        delete_unreferenced_files(names, time.time() - min_age)
+    finally:
+        connections.close_all()
+
+
+def get_removal_executor():
+    pid = os.getpid()
+    if pid not in removal_executors:
+        removal_executors.clear()
+        removal_executors[pid] = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='media-removal'
+        )
+    return removal_executors[pid]
+
+
+def schedule_unreferenced_removal(names, using=None):
+    names = sorted({name for name in names if name})
+    if names:
+        transaction.on_commit(
+            lambda: get_removal_executor().submit(
+                remove_unreferenced_files, names, settings.MEDIA_GC_MIN_AGE
+            ),
+            using=using,
+        )
@@ -0,0 +1,63 @@
+import asyncio
+import contextvars
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.http import StreamingHttpResponse
+
+_exhausted = object()
+
+
+async def iterate_in_thread(iterable):
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    iterator = iter(iterable)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        try:
+            while True:
+                item = await loop.run_in_executor(
+                    executor, context.run, next, iterator, _exhausted
+                )
+                if item is _exhausted:
+                    return
+                yield item
+        finally:
+            await loop.run_in_executor(
+                executor, context.run, close_iteration, iterator
+            )
+
+
+def close_iteration(iterator):
+    try:
+        if hasattr(iterator, 'close'):
+            iterator.close()
+    finally:
+        connections.close_all()
+
+
+def iterate_csv(header, rows, buffer_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= buffer_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_csv(queryset, fields, filename):
+    rows = queryset.using(queryset.db).order_by('pk').values_list(
+        *fields
+    ).iterator(settings.CSV_EXPORT_CHUNK_SIZE)
+    response = StreamingHttpResponse(
+        iterate_csv(fields, rows, settings.CSV_EXPORT_BUFFER_SIZE),
+        content_type='text/csv; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import threading
+import time
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from foodgram.asgi import application
+from recipes.models import Ingredient, Recipe, RecipeIngredient, Tag
+
+User = get_user_model()
+
+benchmark = skipUnless(
+    os.getenv('RUN_BENCHMARKS') == 'True',
+    'Бенчмарки запускаются с RUN_BENCHMARKS=True',
+)
+requires_postgresql = skipUnless(
+    connection.vendor == 'postgresql'
+    or os.getenv('REQUIRE_POSTGRESQL') == 'True',
+    'Проверяется на PostgreSQL',
+)
+
+
+def create_user(username, **kwargs):
+    return User.objects.create_user(
+        username=username,
+        email=f'{username}@example.com',
+        password='password',
+        first_name=username,
+        last_name=username,
+        **kwargs,
+    )
+
+
+def create_tag(slug):
+    return Tag.objects.create(name=slug, slug=slug)
+
+
+def create_ingredient(name, measurement_unit='г'):
+    return Ingredient.objects.create(
+        name=name, measurement_unit=measurement_unit
+    )
+
+
+def create_recipe(author, name='Рецепт', ingredients=None, tags=()):
+    recipe = Recipe.objects.create(
+        author=author,
+        name=name,
+        image='recipe/image/recipe.png',
+        text='Описание',
+        cooking_time=10,
+    )
+    RecipeIngredient.objects.bulk_create(
+        RecipeIngredient(recipe=recipe, ingredient=ingredient, amount=amount)
+        for ingredient, amount in (ingredients or {}).items()
+    )
+    recipe.tags.set(tags)
+    return recipe
+
+
+def measure(function, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat
+
+
+def report(name, **values):
+    print(f'\n{name}: ' + ', '.join(
+        f'{key}={value:.4f}' if isinstance(value, float) else
+        f'{key}={value}'
+        for key, value in values.items()
+    ))
+
+
+def bulk_create_users(count, prefix='user'):
+    User.objects.bulk_create(
+        (
+            User(
+                username=f'{prefix}{number}',
+                email=f'{prefix}{number}@example.com',
+                password='!',
+                first_name=prefix,
+                last_name=prefix,
+            )
+            for number in range(count)
+        ),
+        batch_size=1000,
+    )
+    return list(User.objects.filter(username__startswith=prefix))
+
+
+def bulk_create_recipes(authors, per_author):
+    Recipe.objects.bulk_create(
+        (
+            Recipe(
+                author=author,
+                name=f'Рецепт {number}',
+                image='recipe/image/recipe.png',
+                text='Описание',
+                cooking_time=10,
+            )
+            for author in authors
+            for number in range(per_author)
+        ),
+        batch_size=1000,
+    )
+
+
+async def call_asgi(path, query_string='', headers=(), consume=None):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), *headers],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    status = None
+    body = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message.get('body'):
+            (consume or body.append)(message['body'])
+
+    await application(scope, receive, send)
+    return status, b''.join(body)
+
+
+class StreamHold:
+
+    def __init__(self, timeout=5):
+        self.timeout = timeout
+        self.started = threading.Event()
+        self.released = threading.Event()
+        self.released_in_time = []
+
+    def wrap(self, function):
+        def held(*args, **kwargs):
+            self.started.set()
+            self.released_in_time.append(self.released.wait(self.timeout))
+            yield from function(*args, **kwargs)
+        return held
+
+    async def run(self, stream, request):
+        streamed = asyncio.ensure_future(stream)
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.started.wait, self.timeout
+        )
+        response = await request
+        self.released.set()
+        return response, await streamed
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from core.artifacts import (artifact_exists, artifact_response,
+                            get_artifact_path, store_artifact)
+
+
+class ArtifactTests(SimpleTestCase):
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        settings_override = override_settings(ARTIFACTS_ROOT=root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def age(self, name, seconds):
+        moment = time.time() - seconds
+        os.utime(get_artifact_path(name), (moment, moment))
+
+    def test_garbage_collection_removes_only_expired_artifacts(self):
+        expired = store_artifact(b'expired', '.pdf')
+        fresh = store_artifact(b'fresh', '.pdf')
+        self.age(expired, 7200)
+        call_command(
+            'collect_artifact_garbage', '--max-age', '3600', stdout=StringIO()
+        )
+        self.assertFalse(artifact_exists(expired))
+        self.assertFalse(get_artifact_path(expired).parent.exists())
+        self.assertTrue(artifact_exists(fresh))
+
+    def test_storing_existing_artifact_refreshes_it(self):
+        name = store_artifact(b'content', '.pdf')
+        self.age(name, 7200)
+        self.assertEqual(store_artifact(b'content', '.pdf'), name)
+        call_command(
+            'collect_artifact_garbage', '--max-age', '3600', stdout=StringIO()
+        )
+        self.assertTrue(artifact_exists(name))
+
+    @override_settings(ARTIFACTS_X_ACCEL_REDIRECT=True)
+    def test_accel_redirect_response(self):
+        name = store_artifact(b'content', '.pdf')
+        response = artifact_response(name, 'list.pdf', 'application/pdf')
+        self.assertEqual(response['X-Accel-Redirect'], f'/_artifacts/{name}')
+        self.assertEqual(response.content, b'')
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.test import TransactionTestCase
+from django.test.utils import override_settings
+
+from core.bus import InvalidationBus
+from core.models import CacheVersion
+
+CHANNEL = 'convergence'
+
+
+def get_database_environment():
+    if connection.vendor == 'sqlite':
+        return {
+            'DB_ENGINE': 'sqlite3',
+            'SQLITE_NAME': str(connection.settings_dict['NAME']),
+        }
+    return {'POSTGRES_DB': connection.settings_dict['NAME']}
+
+
+def publish_in_process(count):
+    return subprocess.Popen(
+        [
+            sys.executable,
+            '-c',
+            '; '.join([
+                'import django',
+                'django.setup()',
+                'from core.bus import InvalidationBus',
+                'bus = InvalidationBus()',
+                f'[bus.publish({CHANNEL!r}) for _ in range({count})]',
+            ]),
+        ],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, **get_database_environment()},
+    )
+
+
+def wait_for(condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('Шина не сошлась вовремя')
+        time.sleep(0.05)
+
+
+class InvalidationBusTests(TransactionTestCase):
+
+    def start_bus(self):
+        bus = InvalidationBus()
+        self.addCleanup(bus.stop)
+        return bus
+
+    def test_concurrent_start_runs_one_thread(self):
+        bus = self.start_bus()
+        barrier = threading.Barrier(8)
+
+        def start():
+            barrier.wait()
+            try:
+                bus.ensure_started()
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: start(), range(8)))
+        self.assertTrue(bus.is_running())
+        self.assertEqual(
+            [
+                thread for thread in threading.enumerate()
+                if thread.name == 'cache-invalidation-bus'
+                and thread is not bus.thread
+                and getattr(thread, '_target', None) == bus.run
+            ],
+            [],
+        )
+
+    def test_keys_are_dropped_when_versions_are_skipped(self):
+        bus = self.start_bus()
+        received = []
+        bus.subscribe('tokens', lambda *message: received.append(message))
+        bus.apply('tokens', 1, [1])
+        bus.apply('tokens', 3, [3])
+        bus.apply('tokens', 2, [2])
+        self.assertEqual(received, [('tokens', 1, [1]), ('tokens', 3, None)])
+
+    def test_publish_waits_for_commit(self):
+        bus = self.start_bus()
+        received = []
+        bus.subscribe(CHANNEL, lambda *message: received.append(message))
+        with transaction.atomic():
+            bus.publish(CHANNEL, [1])
+            self.assertFalse(CacheVersion.objects.exists())
+            self.assertEqual(received, [])
+        self.assertEqual(
+            CacheVersion.objects.get(channel=CHANNEL).version, 1
+        )
+        self.assertEqual(received, [(CHANNEL, 1, [1])])
+
+    def test_rolled_back_publish_is_dropped(self):
+        bus = self.start_bus()
+        received = []
+        bus.subscribe(CHANNEL, lambda *message: received.append(message))
+        with transaction.atomic():
+            bus.publish(CHANNEL, [1])
+            transaction.set_rollback(True)
+        self.assertFalse(CacheVersion.objects.exists())
+        self.assertEqual(received, [])
+
+    def test_buses_converge_with_concurrent_publishers(self):
+        threads, per_thread, in_process = 4, 25, 50
+        total = threads * per_thread + in_process
+        with override_settings(
+            CACHE_BUS={**settings.CACHE_BUS, 'POLL_INTERVAL': 0.05}
+        ):
+            listener = self.start_bus()
+            listener.ensure_started()
+            publisher = InvalidationBus()
+            process = publish_in_process(in_process)
+
+            def publish():
+                try:
+                    for _ in range(per_thread):
+                        publisher.publish(CHANNEL)
+                finally:
+                    connections.close_all()
+
+            with ThreadPoolExecutor(threads) as executor:
+                for future in [
+                    executor.submit(publish) for _ in range(threads)
+                ]:
+                    future.result()
+            self.assertEqual(process.wait(60), 0)
+            self.assertEqual(
+                CacheVersion.objects.get(channel=CHANNEL).version, total
+            )
+            wait_for(lambda: listener.versions.get(CHANNEL) == total)
+            publisher.sync()
+            self.assertEqual(publisher.versions[CHANNEL], total)
@@ -0,0 +1,153 @@
+import time
+from unittest import mock, skipUnless
+
+from django.db import close_old_connections, connection, transaction
+from django.test import TransactionTestCase
+
+from core.db.backends.postgresql.base import _pools
+from core.db.utils import set_statement_timeout
+from core.tests.base import benchmark, create_tag, report
+
+requires_postgresql_backend = skipUnless(
+    connection.settings_dict['ENGINE'] == 'core.db.backends.postgresql',
+    'Требуется бэкенд core.db.backends.postgresql',
+)
+
+
+def show_statement_timeout():
+    with connection.cursor() as cursor:
+        cursor.execute('SHOW statement_timeout')
+        return cursor.fetchone()[0]
+
+
+@requires_postgresql_backend
+class HealthCheckTests(TransactionTestCase):
+
+    def setUp(self):
+        connection.ensure_connection()
+        self.settings_dict = connection.settings_dict
+        self.addCleanup(
+            setattr, connection, 'settings_dict', self.settings_dict
+        )
+        connection.settings_dict = {
+            **self.settings_dict,
+            'CONN_MAX_AGE': None,
+            'CONN_HEALTH_CHECKS': True,
+        }
+
+    def run_request(self, queries):
+        close_old_connections()
+        for _ in range(queries):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        close_old_connections()
+
+    def test_connection_is_checked_once_per_request(self):
+        with mock.patch.object(
+            connection, 'is_usable', wraps=connection.is_usable
+        ) as is_usable:
+            self.run_request(queries=5)
+            self.assertEqual(is_usable.call_count, 1)
+            self.run_request(queries=5)
+            self.assertEqual(is_usable.call_count, 2)
+
+    def test_stale_pooled_connection_is_replaced_on_checkout(self):
+        connection.settings_dict = {
+            **connection.settings_dict, 'CONN_MAX_AGE': 0, 'POOL_SIZE': 1
+        }
+        self.addCleanup(_pools.pop, connection.alias, None)
+        self.run_request(queries=1)
+        pooled = _pools[connection.alias].queue[-1]
+        other = connection.Database.connect(
+            **connection.get_connection_params()
+        )
+        self.addCleanup(other.close)
+        with other.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_terminate_backend(%s)', [pooled.get_backend_pid()]
+            )
+        close_old_connections()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertIsNot(connection.connection, pooled)
+        close_old_connections()
+
+    def test_unusable_connection_is_replaced(self):
+        close_old_connections()
+        with mock.patch.object(connection, 'is_usable', return_value=False):
+            broken = connection.connection
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        self.assertIsNot(connection.connection, broken)
+
+
+@requires_postgresql_backend
+class StatementTimeoutTests(TransactionTestCase):
+
+    def tearDown(self):
+        set_statement_timeout(None)
+
+    def test_timeout_is_reapplied_after_savepoint_rollback(self):
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    set_statement_timeout(1234)
+                    self.assertEqual(show_statement_timeout(), '1234ms')
+                    raise ValueError
+            except ValueError:
+                pass
+            self.assertEqual(show_statement_timeout(), '1234ms')
+
+    def test_timeout_is_reapplied_after_rollback(self):
+        try:
+            with transaction.atomic():
+                set_statement_timeout(1234)
+                show_statement_timeout()
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(show_statement_timeout(), '1234ms')
+
+
+@benchmark
+class ConnectionReuseBenchmark(TransactionTestCase):
+    requests = 300
+
+    def setUp(self):
+        for number in range(20):
+            create_tag(f'tag-{number}')
+        self.settings_dict = connection.settings_dict
+        self.addCleanup(
+            setattr, connection, 'settings_dict', self.settings_dict
+        )
+
+    def measure_requests(self, conn_max_age):
+        connection.settings_dict = {
+            **self.settings_dict, 'CONN_MAX_AGE': conn_max_age
+        }
+        close_old_connections()
+        connection.close()
+        latencies = []
+        for _ in range(self.requests):
+            started = time.perf_counter()
+            close_old_connections()
+            response = self.client.get('/api/tags/')
+            close_old_connections()
+            latencies.append(time.perf_counter() - started)
+            self.assertEqual(response.status_code, 200)
+        latencies.sort()
+        return (
+            latencies[len(latencies) // 2],
+            latencies[int(len(latencies) * 0.99)],
+        )
+
+    def test_persistent_connections(self):
+        per_request = self.measure_requests(0)
+        persistent = self.measure_requests(60)
+        report(
+            'tags list, p50/p99, с',
+            per_request_p50=per_request[0],
+            per_request_p99=per_request[1],
+            persistent_p50=persistent[0],
+            persistent_p99=persistent[1],
+        )
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db.models import FileField
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from core.tests.base import create_recipe, create_user
+
+RECIPE_IMAGE = 'recipe/image/recipe.png'
+
+
+def count_file_fields():
+    return sum(
+        isinstance(field, FileField)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+    )
+
+
+class CollectMediaGarbageTests(TestCase):
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        settings_override = override_settings(MEDIA_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        create_recipe(create_user('author'))
+
+    def create_file(self, name, age=0):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(b'content')
+        moment = time.time() - age
+        os.utime(path, (moment, moment))
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.root, name))
+
+    def collect(self, *arguments):
+        output = StringIO()
+        call_command(
+            'collect_media_garbage', '--min-age', '3600', *arguments,
+            stdout=output,
+        )
+        return output.getvalue()
+
+    def test_only_old_unreferenced_files_are_removed(self):
+        self.create_file(RECIPE_IMAGE, age=7200)
+        for number in range(5):
+            self.create_file(f'recipe/image/old{number}.png', age=7200)
+        self.create_file('recipe/image/fresh.png')
+        output = self.collect('--batch-size', '2')
+        self.assertTrue(self.exists(RECIPE_IMAGE))
+        self.assertTrue(self.exists('recipe/image/fresh.png'))
+        for number in range(5):
+            self.assertFalse(self.exists(f'recipe/image/old{number}.png'))
+        self.assertIn('Проверено файлов: 6, без ссылок: 5', output)
+
+    def test_dry_run_keeps_files(self):
+        self.create_file('recipe/image/old.png', age=7200)
+        output = self.collect('--dry-run')
+        self.assertTrue(self.exists('recipe/image/old.png'))
+        self.assertIn('recipe/image/old.png', output)
+
+    def test_queries_are_batched(self):
+        for number in range(6):
+            self.create_file(f'recipe/image/old{number}.png', age=7200)
+        with self.assertNumQueries(3 * count_file_fields()):
+            self.collect('--batch-size', '2', '--dry-run')
+
+    def test_files_are_rechecked_before_removal(self):
+        self.create_file(RECIPE_IMAGE, age=7200)
+        self.create_file('recipe/image/touched.png', age=7200)
+
+        def scan_references(names):
+            self.create_file('recipe/image/touched.png')
+            return set()
+
+        with mock.patch(
+            'core.management.commands.collect_media_garbage.'
+            'get_referenced_names',
+            side_effect=scan_references,
+        ):
+            output = self.collect()
+        self.assertTrue(self.exists(RECIPE_IMAGE))
+        self.assertTrue(self.exists('recipe/image/touched.png'))
+        self.assertIn('Проверено файлов: 2, без ссылок: 0', output)
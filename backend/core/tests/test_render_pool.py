@@ -0,0 +1,81 @@
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from core.render_pool import RenderPool, RenderPoolBusy
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('Условие не выполнилось вовремя')
+        time.sleep(0.05)
+
+
+class RenderPoolTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.pool = RenderPool(
+            'test',
+            workers=1,
+            max_pending=4,
+            max_per_user=1,
+            timeout=0.5,
+            retry_after=3,
+        )
+        self.addCleanup(self.shutdown_pool)
+
+    def shutdown_pool(self):
+        if self.pool.executor is not None:
+            self.pool.executor.shutdown(wait=True)
+
+    def get_user_slots(self, user_id):
+        return cache.get(self.pool.get_user_slots_key(user_id))
+
+    def test_run_returns_result(self):
+        self.assertEqual(self.pool.run(1, abs, -5), 5)
+        self.assertEqual(self.pool.pending, 0)
+        self.assertEqual(self.get_user_slots(1), 0)
+
+    def test_run_async_returns_result(self):
+        self.assertEqual(async_to_sync(self.pool.run_async)(1, abs, -5), 5)
+        self.assertEqual(self.pool.pending, 0)
+
+    def test_per_user_limit_is_counted_in_cache(self):
+        future = self.pool.submit(1, time.sleep, 1)
+        self.assertEqual(self.get_user_slots(1), 1)
+        with self.assertRaises(RenderPoolBusy):
+            self.pool.submit(1, abs, -1)
+        self.assertEqual(self.pool.submit(2, abs, -1).result(10), 1)
+        future.result(10)
+        wait_for(lambda: self.get_user_slots(1) == 0)
+
+    def test_timed_out_job_keeps_its_slot_until_it_finishes(self):
+        with self.assertRaises(RenderPoolBusy):
+            self.pool.run(1, time.sleep, 1.5)
+        self.assertEqual(self.pool.pending, 1)
+        self.assertEqual(self.get_user_slots(1), 1)
+        wait_for(lambda: self.pool.pending == 0)
+        self.assertEqual(self.get_user_slots(1), 0)
+
+    def test_async_timeout_raises_busy_and_releases_slot(self):
+        with self.assertRaises(RenderPoolBusy) as context:
+            async_to_sync(self.pool.run_async)(1, time.sleep, 1.5)
+        self.assertEqual(context.exception.retry_after, 3)
+        wait_for(lambda: self.pool.pending == 0)
+
+    def test_queued_job_is_cancelled_on_timeout(self):
+        self.pool.max_per_user = 4
+        running = self.pool.submit(1, time.sleep, 1.5)
+        wait_for(running.running)
+        queued = [self.pool.submit(1, time.sleep, 1.5) for _ in range(2)]
+        with self.assertRaises(RenderPoolBusy):
+            self.pool.run(1, abs, -1)
+        self.assertEqual(self.pool.pending, 3)
+        self.assertEqual(self.get_user_slots(1), 3)
+        wait_for(lambda: all(future.done() for future in queued))
+        wait_for(lambda: self.pool.pending == 0)
@@ -0,0 +1,62 @@
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from django.test import SimpleTestCase, override_settings
+
+from core.db.routers import (PIN_CACHE_KEY, ReplicaRouter, check_replica_cache,
+                             is_user_pinned_to_primary, pin_user_to_primary,
+                             reset_read_routing, route_reads_to_replica)
+from recipes.models import Recipe
+from users.models import UserProfile
+
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+}
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'cache_table',
+    }
+}
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaCacheCheckTests(SimpleTestCase):
+
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_replicas_require_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_replica_cache()
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_shared_cache_is_accepted(self):
+        check_replica_cache()
+
+    @override_settings(DATABASE_REPLICAS=[], CACHES=LOCAL_CACHES)
+    def test_local_cache_is_enough_without_replicas(self):
+        check_replica_cache()
+
+
+@override_settings(CACHES=LOCAL_CACHES, REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTests(SimpleTestCase):
+
+    def test_pin_is_stored_in_configured_cache(self):
+        user = UserProfile(pk=42)
+        self.assertFalse(is_user_pinned_to_primary(user))
+        pin_user_to_primary(user)
+        self.assertTrue(caches['default'].get(PIN_CACHE_KEY.format(42)))
+        self.assertTrue(is_user_pinned_to_primary(user))
+
+    @override_settings(DATABASE_REPLICAS=['replica_1'])
+    def test_cache_table_is_read_from_primary(self):
+        router = ReplicaRouter()
+        cache_model = DatabaseCache('cache_table', {}).cache_model_class
+        token = route_reads_to_replica()
+        try:
+            self.assertEqual(router.db_for_read(Recipe), 'replica_1')
+            self.assertEqual(
+                router.db_for_read(cache_model), DEFAULT_DB_ALIAS
+            )
+        finally:
+            reset_read_routing(token)
@@ -0,0 +1,157 @@
+import csv
+import io
+import tracemalloc
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import streaming
+from core.streaming import iterate_csv
+from core.tests.base import (StreamHold, benchmark, call_asgi,
+                             create_ingredient, create_recipe, create_user,
+                             report)
+from recipes.models import User
+
+MEMORY_CEILING = 8 * 1024 * 1024
+
+
+def consume(chunks):
+    tracemalloc.start()
+    try:
+        lines = sum(chunk.count('\n') for chunk in chunks)
+        return lines, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def iter_synthetic_rows(count):
+    for number in range(count):
+        yield number, f'Ингредиент {number}', 'г'
+
+
+def read_content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+class IterateCsvTests(SimpleTestCase):
+
+    def test_peak_memory_does_not_grow_with_rows(self):
+        header = ('id', 'name', 'measurement_unit')
+        peaks = []
+        for count in (10000, 100000):
+            lines, peak = consume(iterate_csv(
+                header,
+                iter_synthetic_rows(count),
+                settings.CSV_EXPORT_BUFFER_SIZE,
+            ))
+            self.assertEqual(lines, count + 1)
+            peaks.append(peak)
+        self.assertLess(peaks[1], MEMORY_CEILING)
+        self.assertLess(peaks[1], peaks[0] * 2)
+
+
+class ExportViewSetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = create_user('author')
+        create_recipe(self.author, name='Борщ', ingredients={
+            create_ingredient('Свёкла'): 300,
+        })
+
+    def test_requires_staff(self):
+        self.assertEqual(self.client.get('/api/exports/recipes/').status_code,
+                         401)
+        self.client.force_authenticate(self.author)
+        self.assertEqual(self.client.get('/api/exports/recipes/').status_code,
+                         403)
+
+    def test_streams_csv(self):
+        self.client.force_authenticate(
+            create_user('admin', is_staff=True)
+        )
+        response = self.client.get('/api/exports/recipes/')
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="recipes.csv"',
+        )
+        rows = list(csv.reader(io.StringIO(read_content(response))))
+        self.assertEqual(rows[0][:2], ['id', 'name'])
+        self.assertEqual(rows[1][1:4], ['Борщ', str(self.author.id),
+                                        'author@example.com'])
+        self.assertEqual(len(rows), 2)
+
+
+def get_authorization(user):
+    token = Token.objects.create(user=user)
+    return [(b'authorization', f'Token {token.key}'.encode())]
+
+
+class ExportAsgiTests(TransactionTestCase):
+
+    def setUp(self):
+        author = create_user('author')
+        for number in range(3):
+            create_recipe(author, name=f'Рецепт {number}')
+        self.headers = get_authorization(
+            create_user('admin', is_staff=True)
+        )
+
+    def test_export_does_not_block_event_loop(self):
+        hold = StreamHold()
+        with mock.patch.object(
+            streaming, 'iterate_csv', hold.wrap(iterate_csv)
+        ):
+            (status, _), (export_status, body) = async_to_sync(hold.run)(
+                call_asgi('/api/exports/recipes/', headers=self.headers),
+                call_asgi('/api/tags/'),
+            )
+        self.assertEqual(hold.released_in_time, [True])
+        self.assertEqual(status, 200)
+        self.assertEqual(export_status, 200)
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        self.assertEqual(len(rows), 4)
+
+
+@benchmark
+class ExportAsgiBenchmark(TransactionTestCase):
+
+    def test_million_rows_under_memory_ceiling(self):
+        count = 1000000
+        User.objects.bulk_create(
+            (
+                User(
+                    username=f'user{number}',
+                    email=f'user{number}@example.com',
+                    password='!',
+                    first_name='Имя',
+                    last_name='Фамилия',
+                )
+                for number in range(count)
+            ),
+            batch_size=10000,
+        )
+        headers = get_authorization(create_user('admin', is_staff=True))
+        lines = 0
+
+        def count_lines(chunk):
+            nonlocal lines
+            lines += chunk.count(b'\n')
+
+        tracemalloc.start()
+        try:
+            status, _ = async_to_sync(call_asgi)(
+                '/api/exports/users/', headers=headers, consume=count_lines
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        report('выгрузка 1 000 000 строк через ASGI', peak_kb=peak // 1024)
+        self.assertEqual(status, 200)
+        self.assertEqual(lines, count + 2)
+        self.assertLess(peak, MEMORY_CEILING)
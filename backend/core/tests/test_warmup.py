@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from django.urls import ResolverMatch
+
+from api import async_views
+from api.caching import RESPONSE_CACHE_KEY
+from core import warmup
+from core.tests.base import create_ingredient, create_tag
+
+
+def get_cached_response(namespace, path):
+    return cache.get(RESPONSE_CACHE_KEY.format(
+        namespace, warmup.bus.get_version(namespace), path
+    ))
+
+
+@mock.patch.object(warmup.bus, 'ensure_started')
+class WarmUpTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        create_tag('breakfast')
+        create_ingredient('Соль')
+
+    def test_worker_warm_up_primes_reference_caches(self, ensure_started):
+        warmup.warm_up_worker()
+        ensure_started.assert_called()
+        self.assertIsNotNone(get_cached_response('tags', '/api/tags/'))
+        self.assertIsNotNone(
+            get_cached_response('ingredients', '/api/ingredients/')
+        )
+
+    def test_async_views_are_primed(self, ensure_started):
+        with mock.patch.object(
+            warmup,
+            'resolve',
+            return_value=ResolverMatch(async_views.tag_list, (), {}),
+        ):
+            response = warmup.prime_url('/api/tags/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(get_cached_response('tags', '/api/tags/'))
+
+    def test_failed_request_does_not_stop_warm_up(self, ensure_started):
+        with self.settings(WARMUP_URLS=['/missing/', '/api/tags/']):
+            with self.assertLogs('core.warmup', 'ERROR'):
+                warmup.warm_up_worker()
+        self.assertIsNotNone(get_cached_response('tags', '/api/tags/'))
@@ -2,14 +2,9 @@ import io
 
 from django.conf import settings
 from django.http import FileResponse
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfgen import canvas
 
 
 class ShoppingCartPdfGenerator:
-    WIDTH, HEIGHT = A4
     LINE_HEIGHT = 15
     MARGIN_TOP = 50
     MARGIN_BOTTOM = 50
@@ -17,20 +12,28 @@ class ShoppingCartPdfGenerator:
     KEY_AMOUNT = 'amount'
     KEY_MEAS_UNIT = 'meas_unit'
 
-    def __init__(self, page_objects):
+    def __init__(self, page_objects, font_path=None):
         self.page_objects = page_objects
+        self.font_path = font_path or settings.PDF_FONT_PATH
 
     def gen_new_page(self, pdf):
-        pdfmetrics.registerFont(TTFont('DejaVuSans', settings.PDF_FONT_PATH))
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        pdfmetrics.registerFont(TTFont('DejaVuSans', self.font_path))
         pdf.setFont('DejaVuSans', 15)
         header_width = pdf.stringWidth(self.FILE_HEADER, 'DejaVuSans', 15)
-        x_position = (self.WIDTH - header_width) / 2
-        y_position = self.HEIGHT - self.MARGIN_TOP
+        x_position = (self.width - header_width) / 2
+        y_position = self.height - self.MARGIN_TOP
         pdf.drawString(x_position, y_position, self.FILE_HEADER)
         y_position -= self.LINE_HEIGHT * 2
         return y_position
 
-    def return_pdf(self):
+    def render(self):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
+        self.width, self.height = A4
         buffer = io.BytesIO()
         pdf = canvas.Canvas(buffer, pagesize=A4)
         y_position = self.gen_new_page(pdf)
@@ -50,11 +53,17 @@ class ShoppingCartPdfGenerator:
             )
             y_position -= self.LINE_HEIGHT
         pdf.save()
-        buffer.seek(0)
+        return buffer.getvalue()
+
+    def return_pdf(self):
         response = FileResponse(
-            buffer,
+            io.BytesIO(self.render()),
             as_attachment=True,
             filename='Shopping_cart.pdf',
             content_type='application/pdf'
         )
         return response
+
+
+def render_shopping_cart_pdf(page_objects, font_path):
+    return ShoppingCartPdfGenerator(page_objects, font_path).render()
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from importlib import import_module
+
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import get_resolver, resolve
+
+from .bus import bus
+
+logger = logging.getLogger(__name__)
+
+
+def preload_application():
+    for module in settings.WARMUP_IMPORTS:
+        import_module(module)
+    get_resolver().reverse_dict
+    for model in apps.get_models():
+        model._meta.get_fields()
+    connections.close_all()
+
+
+def prime_url(path):
+    match = resolve(path)
+    request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING='gzip')
+    if asyncio.iscoroutinefunction(match.func):
+        response = async_to_sync(match.func)(
+            request, *match.args, **match.kwargs
+        )
+    else:
+        response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+def warm_up_worker():
+    bus.ensure_started()
+    for path in settings.WARMUP_URLS:
+        try:
+            prime_url(path)
+        except Exception:
+            logger.exception('Warm-up request to %s failed', path)
+    connections.close_all()
@@ -60,18 +60,62 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'foodgram.wsgi.application'
 
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.db.backends.postgresql',
         'NAME': os.getenv('POSTGRES_DB', 'django'),
         'USER': os.getenv('POSTGRES_USER', 'django'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', ''),
-        'PORT': os.getenv('DB_PORT', 5432)
+        'PORT': os.getenv('DB_PORT', 5432),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        'POOL_SIZE': int(os.getenv('DB_POOL_SIZE', 0)),
+    }
+}
+
+if os.getenv('DB_ENGINE') == 'sqlite3':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('SQLITE_NAME', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    }
+
+DATABASE_REPLICAS = []
+
+for number, host in enumerate(
+    filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1
+):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+DATABASE_STATEMENT_TIMEOUTS = {
+    'reference': int(os.getenv('DB_STATEMENT_TIMEOUT_REFERENCE', 1000)),
+    'default': int(os.getenv('DB_STATEMENT_TIMEOUT_DEFAULT', 5000)),
+    'report': int(os.getenv('DB_STATEMENT_TIMEOUT_REPORT', 30000)),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -119,10 +163,43 @@ USER_PROFILE_NAME_MAX = 150
 
 MIN_VALUE_FOR_AMOUNT_COOKING_TIME = 1
 
+RECIPE_BULK_ACTION_MAX = 100
+
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(
+    os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', 256 * 1024)
+)
+
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+
+MEDIA_GC_MIN_AGE = int(os.getenv('MEDIA_GC_MIN_AGE', 3600))
+
+BULK_DELETE_BATCH_SIZE = int(os.getenv('BULK_DELETE_BATCH_SIZE', 1000))
+
+CHANGES_CURSOR_OVERLAP = int(os.getenv('CHANGES_CURSOR_OVERLAP', 60))
+
+TOMBSTONE_RETENTION_DAYS = int(os.getenv('TOMBSTONE_RETENTION_DAYS', 30))
+
+PERIODIC_TASKS = [
+    ('purge_tombstones', [], 24 * 60 * 60),
+    ('collect_artifact_garbage', [], 60 * 60),
+    ('collect_media_garbage', [], 24 * 60 * 60),
+    ('rebuild_similar_recipes', ['--changed-within', '900'], 10 * 60),
+    ('rebuild_similar_recipes', [], 24 * 60 * 60),
+]
+
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv('ADMIN_EXACT_COUNT_LIMIT', 10000))
+
+ARTIFACTS_ROOT = os.getenv('ARTIFACTS_ROOT', os.path.join(BASE_DIR, 'artifacts'))
+ARTIFACTS_ACCEL_PREFIX = '/_artifacts/'
+ARTIFACTS_X_ACCEL_REDIRECT = (
+    os.getenv('ARTIFACTS_X_ACCEL_REDIRECT', 'False') == 'True'
+)
+ARTIFACTS_MAX_AGE = int(os.getenv('ARTIFACTS_MAX_AGE', 24 * 60 * 60))
+
 
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
@@ -130,11 +207,47 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'api.parsers.MultiPartJSONParser',
     ),
     'PAGE_SIZE': 3
 }
 
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 100))
+
+NDJSON_STREAM_CHUNK_SIZE = int(os.getenv('NDJSON_STREAM_CHUNK_SIZE', 500))
+
+NDJSON_STREAM_MAX_ROWS = int(os.getenv('NDJSON_STREAM_MAX_ROWS', 10000))
+
+CSV_EXPORT_CHUNK_SIZE = int(os.getenv('CSV_EXPORT_CHUNK_SIZE', 2000))
+
+CSV_EXPORT_BUFFER_SIZE = int(os.getenv('CSV_EXPORT_BUFFER_SIZE', 64 * 1024))
+
+CACHE_BUS = {
+    'ENABLED': os.getenv('CACHE_BUS_ENABLED', 'True') == 'True',
+    'CHANNEL': os.getenv('CACHE_BUS_CHANNEL', 'foodgram_cache'),
+    'POLL_INTERVAL': float(os.getenv('CACHE_BUS_POLL_INTERVAL', 1)),
+    'SYNC_INTERVAL': float(os.getenv('CACHE_BUS_SYNC_INTERVAL', 30)),
+}
+
+SIMILAR_RECIPES_TOP_K = int(os.getenv('SIMILAR_RECIPES_TOP_K', 10))
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.getenv('TOKEN_AUTH_CACHE_MAX_SIZE', 10000)),
+    'TTL': int(os.getenv('TOKEN_AUTH_CACHE_TTL', 60)),
+    'SHARED_CACHE': os.getenv('TOKEN_AUTH_SHARED_CACHE'),
+}
+
 
 DJOSER = {
     'LOGIN_FILED': 'email',
@@ -151,3 +264,24 @@ DJOSER = {
 }
 
 PDF_FONT_PATH = BASE_DIR / 'core/font/dejavu-sans-webfont.ttf'
+
+WARMUP_IMPORTS = [
+    ROOT_URLCONF,
+    'PIL.Image',
+]
+
+WARMUP_URLS = [
+    '/api/tags/',
+    '/api/ingredients/',
+]
+
+PDF_RENDER_POOL = {
+    'WORKERS': int(os.getenv('PDF_RENDER_WORKERS', 2)),
+    'MAX_PENDING': int(os.getenv('PDF_RENDER_MAX_PENDING', 8)),
+    'MAX_PER_USER': int(os.getenv('PDF_RENDER_MAX_PER_USER', 1)),
+    'TIMEOUT': int(os.getenv('PDF_RENDER_TIMEOUT', 30)),
+    'RETRY_AFTER': int(os.getenv('PDF_RENDER_RETRY_AFTER', 5)),
+    'CACHE_TIMEOUT': int(os.getenv('PDF_RENDER_CACHE_TIMEOUT', 600)),
+    'START_METHOD': os.getenv('PDF_RENDER_START_METHOD', 'spawn'),
+    'CACHE': os.getenv('PDF_RENDER_CACHE', 'default'),
+}
@@ -1,10 +1,14 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
-from api.views import redirect_to_recipe
+if settings.ASYNC_READ_VIEWS:
+    from api.async_views import async_redirect_to_recipe as redirect_view
+else:
+    from api.views import redirect_to_recipe as redirect_view
 
 urlpatterns = [
     path('api/', include('api.urls')),
     path('admin/', admin.site.urls),
-    path('s/<str:short_url>/', redirect_to_recipe),
+    path('s/<str:short_url>/', redirect_view),
 ]
@@ -0,0 +1,24 @@
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+wsgi_app = os.getenv('GUNICORN_APP', 'foodgram.asgi:application')
+worker_class = os.getenv(
+    'GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker'
+)
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from core.warmup import preload_application
+
+    preload_application()
+
+
+def post_worker_init(worker):
+    from core.warmup import warm_up_worker
+
+    warm_up_worker()
@@ -1,5 +1,12 @@
 from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
+from core.admin import (BulkDeleteAdminMixin, CsvExportAdminMixin,
+                        LargeTableAdminMixin)
+
+from .deletion import delete_recipes
+from .export import RECIPE_EXPORT_FIELDS, RELATION_EXPORT_FIELDS
 from .models import (Favorite, Ingredient, Recipe, RecipeIngredient,
                      ShoppingCart, Tag)
 
@@ -7,14 +14,25 @@ from .models import (Favorite, Ingredient, Recipe, RecipeIngredient,
 class IngredientInline(admin.TabularInline):
     model = RecipeIngredient
     extra = 0
+    autocomplete_fields = ('ingredient',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'recipe', 'ingredient'
+        )
 
 
 class TagInline(admin.TabularInline):
     model = Recipe.tags.through
     extra = 0
+    autocomplete_fields = ('tag',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('recipe', 'tag')
 
-class RecipeAdmin(admin.ModelAdmin):
+
+class RecipeAdmin(BulkDeleteAdminMixin, CsvExportAdminMixin,
+                  LargeTableAdminMixin, admin.ModelAdmin):
     inlines = (
         IngredientInline,
         TagInline,
@@ -23,24 +41,52 @@ class RecipeAdmin(admin.ModelAdmin):
     list_display = (
         'name',
         'author',
+        'favorites_count',
     )
+    list_select_related = ('author',)
+    autocomplete_fields = ('author',)
     search_fields = ('author__email', 'name')
     list_filter = ('tags__slug',)
     date_hierarchy = 'pub_date'
+    export_fields = RECIPE_EXPORT_FIELDS
+
+    def get_queryset(self, request):
+        favorites = Favorite.objects.filter(
+            recipe=OuterRef('pk')
+        ).order_by().values('recipe').annotate(total=Count('*'))
+        return super().get_queryset(request).annotate(
+            favorites_count=Coalesce(
+                Subquery(favorites.values('total')),
+                0,
+                output_field=IntegerField(),
+            )
+        )
 
     def favorites_count(self, obj):
-        return obj.favorite_recipes.count()
+        return obj.favorites_count
 
     favorites_count.short_description = 'Добавили в избранное (кол-во раз)'
+    favorites_count.admin_order_field = 'favorites_count'
 
+    def delete_objects(self, queryset):
+        return delete_recipes(queryset)
 
-class UserRecipeAdmin(admin.ModelAdmin):
-    list_display = ('user', 'recipe')
-    list_filter = ('user', 'recipe')
+
+class UserRecipeAdmin(CsvExportAdminMixin, LargeTableAdminMixin,
+                      admin.ModelAdmin):
+    list_display = ('user', 'recipe', 'created_at')
+    list_select_related = ('user', 'recipe')
+    autocomplete_fields = ('user', 'recipe')
     search_fields = ('user__email', 'recipe__name')
+    export_fields = RELATION_EXPORT_FIELDS
+
+
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name', 'slug')
 
 
-class IngredientAdmin(admin.ModelAdmin):
+class IngredientAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'name',
         'measurement_unit'
@@ -48,7 +94,7 @@ class IngredientAdmin(admin.ModelAdmin):
     search_fields = ('name',)
 
 
-admin.site.register(Tag)
+admin.site.register(Tag, TagAdmin)
 admin.site.register(Ingredient, IngredientAdmin)
 admin.site.register(Recipe, RecipeAdmin)
 admin.site.register(Favorite, UserRecipeAdmin)
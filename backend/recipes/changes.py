@@ -0,0 +1,49 @@
+from django.db.models import Q
+
+from .models import Recipe, RecipeTombstone
+
+
+def get_changes(sources, position, limit):
+    entries = []
+    for queryset, time_field, id_field, deleted in sources:
+        if position is not None:
+            changed_at, object_id = position
+            queryset = queryset.filter(
+                Q(**{f'{time_field}__gt': changed_at})
+                | Q(**{time_field: changed_at, f'{id_field}__gt': object_id})
+            )
+        entries.extend(
+            (changed_at, object_id, deleted)
+            for changed_at, object_id in queryset.order_by(
+                time_field, id_field
+            ).values_list(time_field, id_field)[:limit + 1]
+        )
+    return sorted(entries)[:limit + 1]
+
+
+def get_recipe_changes(position, limit):
+    return get_changes(
+        [
+            (Recipe.objects.all(), 'updated_at', 'id', False),
+            (RecipeTombstone.objects.all(), 'deleted_at', 'recipe_id', True),
+        ],
+        position,
+        limit,
+    )
+
+
+def get_relation_changes(service, user, position, limit):
+    return get_changes(
+        [
+            (
+                service.model.objects.filter(user=user),
+                'created_at', 'recipe_id', False
+            ),
+            (
+                service.tombstone_model.objects.filter(user=user),
+                'deleted_at', 'recipe_id', True
+            ),
+        ],
+        position,
+        limit,
+    )
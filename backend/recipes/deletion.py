@@ -0,0 +1,71 @@
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+
+from core.bus import bus
+from core.db.deletion import delete_batch, iter_pk_batches
+from core.storage import schedule_unreferenced_removal
+
+from . import relations, shopping_list
+from .models import Recipe, RecipeIngredient, RecipeTombstone, ShoppingCart
+
+User = get_user_model()
+
+RECIPE_SILENT_MODELS = (Recipe, RecipeIngredient, ShoppingCart)
+USER_SILENT_MODELS = (ShoppingCart,)
+
+
+def get_file_names(model, field_name, pks, using):
+    return list(model._base_manager.using(using).filter(
+        pk__in=pks
+    ).values_list(field_name, flat=True))
+
+
+def delete_recipe_batch(recipe_ids, using, batch_size):
+    cart_user_ids = list(ShoppingCart.objects.using(using).filter(
+        recipe_id__in=recipe_ids
+    ).values_list('user_id', flat=True).distinct())
+    images = get_file_names(Recipe, 'image', recipe_ids, using)
+    relations.bury_recipes(recipe_ids, using)
+    deleted = delete_batch(
+        Recipe, recipe_ids, using, RECIPE_SILENT_MODELS, batch_size
+    )
+    RecipeTombstone.objects.using(using).bulk_create(
+        RecipeTombstone(recipe_id=recipe_id) for recipe_id in recipe_ids
+    )
+    for start in range(0, len(cart_user_ids), batch_size):
+        shopping_list.rebuild(cart_user_ids[start:start + batch_size])
+    schedule_unreferenced_removal(images, using)
+    bus.publish('recipes')
+    return deleted
+
+
+def delete_recipes(queryset, batch_size=None):
+    batch_size = batch_size or settings.BULK_DELETE_BATCH_SIZE
+    using = router.db_for_write(Recipe)
+    deleted = Counter()
+    for recipe_ids in iter_pk_batches(queryset.using(using), batch_size):
+        with transaction.atomic(using=using):
+            deleted += delete_recipe_batch(recipe_ids, using, batch_size)
+    return sum(deleted.values()), dict(deleted)
+
+
+def delete_users(queryset, batch_size=None):
+    batch_size = batch_size or settings.BULK_DELETE_BATCH_SIZE
+    using = router.db_for_write(User)
+    deleted = Counter()
+    with transaction.atomic(using=using):
+        for user_ids in iter_pk_batches(queryset.using(using), batch_size):
+            for recipe_ids in iter_pk_batches(
+                Recipe.objects.using(using).filter(author_id__in=user_ids),
+                batch_size,
+            ):
+                deleted += delete_recipe_batch(recipe_ids, using, batch_size)
+            avatars = get_file_names(User, 'avatar', user_ids, using)
+            deleted += delete_batch(
+                User, user_ids, using, USER_SILENT_MODELS, batch_size
+            )
+            schedule_unreferenced_removal(avatars, using)
+    return sum(deleted.values()), dict(deleted)
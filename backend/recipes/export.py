@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+
+from .models import Favorite, Recipe, ShoppingCart
+
+User = get_user_model()
+
+RECIPE_EXPORT_FIELDS = (
+    'id',
+    'name',
+    'author_id',
+    'author__email',
+    'cooking_time',
+    'pub_date',
+    'updated_at',
+)
+USER_EXPORT_FIELDS = (
+    'id',
+    'email',
+    'username',
+    'first_name',
+    'last_name',
+    'is_staff',
+    'is_active',
+    'date_joined',
+)
+RELATION_EXPORT_FIELDS = (
+    'user_id',
+    'user__email',
+    'recipe_id',
+    'recipe__name',
+    'created_at',
+)
+
+EXPORTS = {
+    'recipes': (Recipe, RECIPE_EXPORT_FIELDS),
+    'users': (User, USER_EXPORT_FIELDS),
+    'favorites': (Favorite, RELATION_EXPORT_FIELDS),
+    'shopping_cart': (ShoppingCart, RELATION_EXPORT_FIELDS),
+}
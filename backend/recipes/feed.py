@@ -0,0 +1,113 @@
+from django.db import connections
+from django.db.models import Q
+
+from users.models import Subscription
+
+from .models import Recipe
+
+LATERAL_FEED_SQL = '''
+    SELECT recipe.id, recipe.pub_date
+    FROM {subscription} AS follow
+    CROSS JOIN LATERAL (
+        SELECT id, pub_date
+        FROM {recipe}
+        WHERE author_id = follow.to_userprofile_id {position}
+        ORDER BY pub_date DESC, id DESC
+        LIMIT %s
+    ) AS recipe
+    WHERE follow.from_userprofile_id = %s
+    ORDER BY recipe.pub_date DESC, recipe.id DESC
+    LIMIT %s
+'''
+
+LATERAL_LATEST_RECIPES_SQL = '''
+    SELECT {columns}
+    FROM unnest(%s) AS author(id)
+    CROSS JOIN LATERAL (
+        SELECT *
+        FROM {recipe}
+        WHERE author_id = author.id
+        ORDER BY pub_date DESC, id DESC
+        LIMIT %s
+    ) AS recipe
+    ORDER BY recipe.author_id, recipe.pub_date DESC, recipe.id DESC
+'''
+
+RANKED_LATEST_RECIPES_SQL = '''
+    SELECT {columns}
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY author_id ORDER BY pub_date DESC, id DESC
+        ) AS position
+        FROM {recipe}
+        WHERE author_id IN ({authors})
+    ) AS recipe
+    WHERE recipe.position <= %s
+    ORDER BY recipe.author_id, recipe.pub_date DESC, recipe.id DESC
+'''
+
+
+def get_feed_entries(user, position, limit):
+    using = Recipe.objects.db
+    if connections[using].vendor == 'postgresql':
+        return get_lateral_feed_entries(user, position, limit, using)
+    queryset = Recipe.objects.using(using).filter(
+        author__in=user.subscription.values('id')
+    )
+    if position is not None:
+        pub_date, recipe_id = position
+        queryset = queryset.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=recipe_id)
+        )
+    return list(
+        queryset.order_by('-pub_date', '-id').values_list(
+            'id', 'pub_date'
+        )[:limit]
+    )
+
+
+def get_lateral_feed_entries(user, position, limit, using):
+    connection = connections[using]
+    params = []
+    position_sql = ''
+    if position is not None:
+        position_sql = 'AND (pub_date, id) < (%s, %s)'
+        params.extend(position)
+    sql = LATERAL_FEED_SQL.format(
+        subscription=connection.ops.quote_name(Subscription._meta.db_table),
+        recipe=connection.ops.quote_name(Recipe._meta.db_table),
+        position=position_sql,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [limit, user.id, limit])
+        return cursor.fetchall()
+
+
+def get_latest_recipes(author_ids, limit, fields):
+    author_ids = list(author_ids)
+    latest_recipes = {author_id: [] for author_id in author_ids}
+    if not author_ids or not limit:
+        return latest_recipes
+    using = Recipe.objects.db
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(
+        f'recipe.{quote_name(Recipe._meta.get_field(field).column)}'
+        for field in dict.fromkeys(('id', 'author', 'pub_date', *fields))
+    )
+    recipe_table = quote_name(Recipe._meta.db_table)
+    if connection.vendor == 'postgresql':
+        sql = LATERAL_LATEST_RECIPES_SQL.format(
+            columns=columns, recipe=recipe_table
+        )
+        params = [author_ids, limit]
+    else:
+        sql = RANKED_LATEST_RECIPES_SQL.format(
+            columns=columns,
+            recipe=recipe_table,
+            authors=', '.join(['%s'] * len(author_ids)),
+        )
+        params = [*author_ids, limit]
+    for recipe in Recipe.objects.db_manager(using).raw(sql, params):
+        latest_recipes[recipe.author_id].append(recipe)
+    return latest_recipes
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from recipes.query_plans import explain_hot_queries
+
+
+class Command(BaseCommand):
+    help = ('Проверяет через EXPLAIN, что горячие запросы используют '
+            'ожидаемые индексы (только PostgreSQL)')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Алиас базы данных для проверки',
+        )
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Выводить планы запросов целиком',
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        connection = connections[using]
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                'Проверка планов пропущена: требуется PostgreSQL'
+            ))
+            return
+        failures = []
+        for name, index_name, plan in explain_hot_queries(using):
+            if options['verbose_plans']:
+                self.stdout.write(plan)
+            if index_name in plan:
+                self.stdout.write(f'OK   {name}: {index_name}')
+            else:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(
+                    f'FAIL {name}: не используется {index_name}'
+                ))
+        if failures:
+            raise CommandError(
+                'Запросы без ожидаемых индексов: ' + ', '.join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS('Все планы используют индексы'))
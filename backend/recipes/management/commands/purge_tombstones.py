@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.db.deletion import bulk_delete
+from recipes.models import (FavoriteTombstone, RecipeTombstone,
+                            ShoppingCartTombstone)
+
+TOMBSTONE_MODELS = (RecipeTombstone, FavoriteTombstone, ShoppingCartTombstone)
+
+
+def purge_tombstones(retention_days, batch_size):
+    deadline = timezone.now() - timedelta(days=retention_days)
+    return {
+        model._meta.verbose_name_plural: bulk_delete(
+            model.objects.filter(deleted_at__lt=deadline),
+            batch_size=batch_size,
+        )[0]
+        for model in TOMBSTONE_MODELS
+    }
+
+
+class Command(BaseCommand):
+    help = 'Удаляет записи об удалениях старше срока хранения'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.TOMBSTONE_RETENTION_DAYS,
+            help='Срок хранения записей об удалениях в днях',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.BULK_DELETE_BATCH_SIZE,
+            help='Количество записей, удаляемых за одну транзакцию',
+        )
+
+    def handle(self, *args, **options):
+        purged = purge_tombstones(options['days'], options['batch_size'])
+        for name, count in purged.items():
+            self.stdout.write(f'{name}: {count}')
+        self.stdout.write(self.style.SUCCESS('Устаревшие записи удалены'))
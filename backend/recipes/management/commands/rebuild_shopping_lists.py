@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from recipes import shopping_list
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает списки покупок пользователей по их корзинам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            nargs='+',
+            dest='user_ids',
+            help='id пользователей, для которых нужно пересчитать список',
+        )
+
+    def handle(self, *args, **options):
+        shopping_list.rebuild(options['user_ids'])
+        self.stdout.write(self.style.SUCCESS('Списки покупок пересчитаны'))
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from recipes.similarity import rebuild_similar_recipes
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает похожие рецепты по ингредиентам и тегам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recipe',
+            type=int,
+            nargs='+',
+            dest='recipe_ids',
+            help='id рецептов, для которых нужно пересчитать похожие',
+        )
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            help='Количество похожих рецептов для каждого рецепта',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=512,
+            help='Количество рецептов, сравниваемых за один проход',
+        )
+        parser.add_argument(
+            '--changed-within',
+            type=int,
+            help=('Пересчитать только рецепты, изменённые за указанное '
+                  'число секунд, и затронутые ими'),
+        )
+
+    def handle(self, *args, **options):
+        changed_since = None
+        if options['changed_within'] is not None:
+            changed_since = timezone.now() - timedelta(
+                seconds=options['changed_within']
+            )
+        created = rebuild_similar_recipes(
+            options['recipe_ids'],
+            options['top_k'],
+            options['chunk_size'],
+            changed_since,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Сохранено похожих рецептов: {created}')
+        )
@@ -0,0 +1,66 @@
+# Generated by Django 3.2.3 on 2026-10-19 10:40
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def remove_duplicates(model):
+    duplicates = model.objects.values('user_id', 'recipe_id').annotate(
+        first_id=Min('id'), total=Count('id')
+    ).filter(total__gt=1).order_by()
+    user_ids = set()
+    for duplicate in duplicates:
+        model.objects.filter(
+            user_id=duplicate['user_id'],
+            recipe_id=duplicate['recipe_id'],
+        ).exclude(id=duplicate['first_id']).delete()
+        user_ids.add(duplicate['user_id'])
+    return user_ids
+
+
+def remove_duplicate_relations(apps, schema_editor):
+    remove_duplicates(apps.get_model('recipes', 'Favorite'))
+    ShoppingCart = apps.get_model('recipes', 'ShoppingCart')
+    ShoppingListItem = apps.get_model('recipes', 'ShoppingListItem')
+    user_ids = remove_duplicates(ShoppingCart)
+    if not user_ids:
+        return
+    ShoppingListItem.objects.filter(user_id__in=user_ids).delete()
+    totals = ShoppingCart.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'recipe__recipe_ingredient__ingredient_id'
+    ).annotate(
+        total=Sum('recipe__recipe_ingredient__amount')
+    ).order_by()
+    ShoppingListItem.objects.bulk_create(
+        [
+            ShoppingListItem(
+                user_id=user_id,
+                ingredient_id=ingredient_id,
+                amount=total
+            )
+            for user_id, ingredient_id, total in totals
+            if ingredient_id is not None
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_recipe_author_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_relations, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='favorite',
+            constraint=models.UniqueConstraint(fields=('recipe', 'user'), name='unique_user_recipe_favorite'),
+        ),
+        migrations.AddConstraint(
+            model_name='shoppingcart',
+            constraint=models.UniqueConstraint(fields=('recipe', 'user'), name='unique_user_recipe_shoppingcart'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 3.2.3 on 2026-10-19 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_similarrecipe'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='favoritetombstone',
+            name='favorite_tombstone_user_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='shoppingcarttombstone',
+            name='cart_tombstone_user_idx',
+        ),
+        migrations.AlterField(
+            model_name='favoritetombstone',
+            name='recipe',
+            field=models.BigIntegerField(db_column='recipe_id', verbose_name='Рецепт'),
+        ),
+        migrations.AlterField(
+            model_name='shoppingcarttombstone',
+            name='recipe',
+            field=models.BigIntegerField(db_column='recipe_id', verbose_name='Рецепт'),
+        ),
+        migrations.RenameField(
+            model_name='favoritetombstone',
+            old_name='recipe',
+            new_name='recipe_id',
+        ),
+        migrations.RenameField(
+            model_name='shoppingcarttombstone',
+            old_name='recipe',
+            new_name='recipe_id',
+        ),
+        migrations.AlterField(
+            model_name='favoritetombstone',
+            name='recipe_id',
+            field=models.BigIntegerField(verbose_name='Рецепт'),
+        ),
+        migrations.AlterField(
+            model_name='shoppingcarttombstone',
+            name='recipe_id',
+            field=models.BigIntegerField(verbose_name='Рецепт'),
+        ),
+        migrations.AddIndex(
+            model_name='favoritetombstone',
+            index=models.Index(fields=['user', 'deleted_at', 'recipe_id'], name='favorite_tombstone_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shoppingcarttombstone',
+            index=models.Index(fields=['user', 'deleted_at', 'recipe_id'], name='cart_tombstone_user_idx'),
+        ),
+    ]
@@ -3,7 +3,7 @@ from django.contrib.auth import get_user_model
 from django.db import models
 from django.db.models import BooleanField, Exists, OuterRef, Value
 
-from core.models import UserRecipeRelation
+from core.models import UserRecipeRelation, UserRecipeRelationTombstone
 
 from .validators import validate_for_recipe
 
@@ -51,8 +51,19 @@ class Ingredient(models.Model):
 
 class RecipeQuerySet(models.QuerySet):
 
-    def with_related_data(self):
-        return self.select_related('author').prefetch_related('ingredients')
+    def with_related_data(self, fields=None, expand=()):
+        queryset = self
+        if fields is None or 'author' in fields and 'author' in expand:
+            queryset = queryset.select_related('author')
+        if fields is None or 'ingredients' in fields:
+            queryset = queryset.prefetch_related(
+                'recipe_ingredient__ingredient'
+            )
+        if fields is None or 'tags' in fields:
+            queryset = queryset.prefetch_related('tags')
+        if fields is not None and 'text' not in fields:
+            queryset = queryset.defer('text')
+        return queryset
 
     def annotation_relation_with_user(self, user):
         is_favorited_subquery = Favorite.objects.filter(
@@ -115,11 +126,22 @@ class Recipe(models.Model):
         auto_now_add=True,
         db_index=True,
     )
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
 
     objects = RecipeQuerySet.as_manager()
 
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='recipe_author_pub_date_idx',
+            ),
+            models.Index(
+                fields=['updated_at', 'id'],
+                name='recipe_updated_at_idx',
+            ),
+        ]
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
 
@@ -131,6 +153,7 @@ class RecipeIngredient(models.Model):
     ingredient = models.ForeignKey(
         Ingredient,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Ингредиент',
     )
     amount = models.PositiveIntegerField(
@@ -142,6 +165,7 @@ class RecipeIngredient(models.Model):
         Recipe,
         on_delete=models.CASCADE,
         related_name='recipe_ingredient',
+        db_index=False,
     )
 
     class Meta:
@@ -151,6 +175,12 @@ class RecipeIngredient(models.Model):
                 name='unique_recipe_ingredient',
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['ingredient', 'recipe'],
+                name='recipe_ingredient_reverse_idx',
+            ),
+        ]
         verbose_name = 'Ингредиент рецепта'
         verbose_name_plural = 'Ингредиенты рецепта'
 
@@ -162,11 +192,13 @@ class TagsRecipe(models.Model):
     recipe = models.ForeignKey(
         Recipe,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Рецепт'
     )
     tag = models.ForeignKey(
         Tag,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Тег'
     )
 
@@ -177,6 +209,12 @@ class TagsRecipe(models.Model):
                 name='unique_recipe_tag',
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['tag', 'recipe'],
+                name='tags_recipe_reverse_idx',
+            ),
+        ]
         verbose_name = 'Тег рецепта'
         verbose_name_plural = 'Теги рецепта'
 
@@ -187,7 +225,7 @@ class TagsRecipe(models.Model):
 class Favorite(UserRecipeRelation):
     pass
 
-    class Meta:
+    class Meta(UserRecipeRelation.Meta):
         verbose_name = 'Избранное'
         verbose_name_plural = 'Избранное'
 
@@ -195,11 +233,115 @@ class Favorite(UserRecipeRelation):
 class ShoppingCart(UserRecipeRelation):
     pass
 
-    class Meta:
+    class Meta(UserRecipeRelation.Meta):
         verbose_name = 'Список покупок'
         verbose_name_plural = 'Список покупок'
 
 
+class RecipeTombstone(models.Model):
+    recipe_id = models.BigIntegerField(verbose_name='Рецепт')
+    deleted_at = models.DateTimeField('Дата удаления', auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['deleted_at', 'recipe_id'],
+                name='recipe_tombstone_deleted_idx',
+            ),
+        ]
+        verbose_name = 'Удалённый рецепт'
+        verbose_name_plural = 'Удалённые рецепты'
+
+    def __str__(self) -> str:
+        return f'Удалённый рецепт {self.recipe_id}'
+
+
+class FavoriteTombstone(UserRecipeRelationTombstone):
+
+    class Meta(UserRecipeRelationTombstone.Meta):
+        indexes = [
+            models.Index(
+                fields=['user', 'deleted_at', 'recipe_id'],
+                name='favorite_tombstone_user_idx',
+            ),
+        ]
+        verbose_name = 'Удаление из избранного'
+        verbose_name_plural = 'Удаления из избранного'
+
+
+class ShoppingCartTombstone(UserRecipeRelationTombstone):
+
+    class Meta(UserRecipeRelationTombstone.Meta):
+        indexes = [
+            models.Index(
+                fields=['user', 'deleted_at', 'recipe_id'],
+                name='cart_tombstone_user_idx',
+            ),
+        ]
+        verbose_name = 'Удаление из списка покупок'
+        verbose_name_plural = 'Удаления из списка покупок'
+
+
+class SimilarRecipe(models.Model):
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='similar_recipes',
+        db_index=False,
+        verbose_name='Рецепт',
+    )
+    similar = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='similar_to',
+        verbose_name='Похожий рецепт',
+    )
+    score = models.FloatField('Степень сходства')
+    rank = models.PositiveSmallIntegerField('Позиция')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'rank'],
+                name='unique_similar_recipe_rank',
+            )
+        ]
+        verbose_name = 'Похожий рецепт'
+        verbose_name_plural = 'Похожие рецепты'
+
+    def __str__(self) -> str:
+        return f'{self.similar_id} похож на {self.recipe_id}'
+
+
+class ShoppingListItem(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='shopping_list',
+        verbose_name='Пользователь',
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        verbose_name='Ингредиент',
+    )
+    amount = models.IntegerField(verbose_name='Количество ингредиента')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'ingredient'],
+                name='unique_shopping_list_item',
+            )
+        ]
+        verbose_name = 'Позиция списка покупок'
+        verbose_name_plural = 'Позиции списка покупок'
+
+    def __str__(self) -> str:
+        return f'{self.ingredient} в списке покупок {self.user}'
+
+
 class ShortLinkForRecipe(models.Model):
     recipe = models.OneToOneField(Recipe, on_delete=models.CASCADE)
     short_url = models.CharField(max_length=6, unique=True,)
@@ -0,0 +1,84 @@
+from django.db import connections, transaction
+
+from users.models import Subscription
+
+from .models import (Favorite, Recipe, RecipeIngredient, ShoppingCart,
+                     ShoppingListItem, TagsRecipe)
+
+
+def get_hot_queries():
+    return [
+        (
+            'Рецепт в избранном пользователя',
+            Favorite.objects.filter(user_id=1, recipe_id=1),
+            'unique_user_recipe_favorite',
+        ),
+        (
+            'Рецепт в корзине пользователя',
+            ShoppingCart.objects.filter(user_id=1, recipe_id=1),
+            'unique_user_recipe_shoppingcart',
+        ),
+        (
+            'Фильтр is_favorited',
+            Recipe.objects.annotation_relation_with_user(1).filter(
+                is_favorited=True
+            ),
+            'unique_user_recipe_favorite',
+        ),
+        (
+            'Фильтр is_in_shopping_cart',
+            Recipe.objects.annotation_relation_with_user(1).filter(
+                is_in_shopping_cart=True
+            ),
+            'unique_user_recipe_shoppingcart',
+        ),
+        (
+            'Список покупок пользователя',
+            ShoppingListItem.objects.filter(user_id=1),
+            'unique_shopping_list_item',
+        ),
+        (
+            'Рецепты по тегу',
+            TagsRecipe.objects.filter(tag_id=1).values('recipe_id'),
+            'tags_recipe_reverse_idx',
+        ),
+        (
+            'Рецепты по ингредиенту',
+            RecipeIngredient.objects.filter(ingredient_id=1).values(
+                'recipe_id'
+            ),
+            'recipe_ingredient_reverse_idx',
+        ),
+        (
+            'Подписчики автора',
+            Subscription.objects.filter(to_userprofile_id=1).values(
+                'from_userprofile_id'
+            ),
+            'users_subscription_to_from_idx',
+        ),
+        (
+            'Лента автора',
+            Recipe.objects.filter(author_id=1).order_by(
+                '-pub_date', '-id'
+            )[:10],
+            'recipe_author_pub_date_idx',
+        ),
+        (
+            'Изменения рецептов',
+            Recipe.objects.filter(updated_at__isnull=False).order_by(
+                'updated_at', 'id'
+            )[:10],
+            'recipe_updated_at_idx',
+        ),
+    ]
+
+
+def explain_hot_queries(using):
+    connection = connections[using]
+    plans = []
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        for name, queryset, index_name in get_hot_queries():
+            plans.append((name, index_name, queryset.using(using).explain()))
+    return plans
@@ -0,0 +1,79 @@
+from django.db import transaction
+
+from core.db.utils import delete_returning, insert_ignore
+
+from . import shopping_list
+from .models import (Favorite, FavoriteTombstone, ShoppingCart,
+                     ShoppingCartTombstone)
+
+
+class RecipeRelationService:
+
+    def __init__(self, model, tombstone_model):
+        self.model = model
+        self.tombstone_model = tombstone_model
+
+    def add(self, user, recipe_id):
+        return bool(self.add_many(user, [recipe_id]))
+
+    def remove(self, user, recipe_id):
+        return bool(self.remove_many(user, [recipe_id]))
+
+    @transaction.atomic
+    def add_many(self, user, recipe_ids):
+        added_ids = insert_ignore(
+            [
+                self.model(user=user, recipe_id=recipe_id)
+                for recipe_id in recipe_ids
+            ],
+            returning='recipe'
+        )
+        if added_ids:
+            self.on_added(user, added_ids)
+        return added_ids
+
+    @transaction.atomic
+    def remove_many(self, user, recipe_ids=None):
+        relations = self.model.objects.filter(user=user)
+        if recipe_ids is not None:
+            relations = relations.filter(recipe_id__in=recipe_ids)
+        removed_ids = delete_returning(relations, returning='recipe')
+        if removed_ids:
+            self.tombstone_model.objects.bulk_create(
+                self.tombstone_model(user=user, recipe_id=recipe_id)
+                for recipe_id in removed_ids
+            )
+            self.on_removed(user, removed_ids)
+        return removed_ids
+
+    def bury_recipes(self, recipe_ids, using):
+        self.tombstone_model.objects.using(using).bulk_create(
+            self.tombstone_model(user_id=user_id, recipe_id=recipe_id)
+            for user_id, recipe_id in self.model.objects.using(using).filter(
+                recipe_id__in=recipe_ids
+            ).values_list('user_id', 'recipe_id').iterator()
+        )
+
+    def on_added(self, user, recipe_ids):
+        pass
+
+    def on_removed(self, user, recipe_ids):
+        pass
+
+
+class ShoppingCartService(RecipeRelationService):
+
+    def on_added(self, user, recipe_ids):
+        shopping_list.add_recipes(user.id, recipe_ids)
+
+    def on_removed(self, user, recipe_ids):
+        shopping_list.remove_recipes(user.id, recipe_ids)
+
+
+favorites = RecipeRelationService(Favorite, FavoriteTombstone)
+shopping_cart = ShoppingCartService(ShoppingCart, ShoppingCartTombstone)
+
+
+def bury_recipes(recipe_ids, using):
+    for service in (favorites, shopping_cart):
+        service.bury_recipes(recipe_ids, using)
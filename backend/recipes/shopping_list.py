@@ -0,0 +1,122 @@
+from django.db import transaction
+from django.db.models import Case, F, Sum, Value, When
+
+from .models import RecipeIngredient, ShoppingCart, ShoppingListItem
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def get_recipes_amounts(recipe_ids):
+    return dict(
+        RecipeIngredient.objects.filter(
+            recipe_id__in=recipe_ids
+        ).values_list('ingredient_id').annotate(total=Sum('amount'))
+    )
+
+
+def get_cart_user_ids(recipe_id):
+    return list(
+        ShoppingCart.objects.filter(
+            recipe_id=recipe_id
+        ).values_list('user_id', flat=True)
+    )
+
+
+@transaction.atomic
+def change_amounts(user_ids, amounts, sign):
+    amounts = {
+        ingredient_id: sign * amount
+        for ingredient_id, amount in amounts.items()
+        if amount
+    }
+    if not user_ids or not amounts:
+        return
+    ShoppingListItem.objects.bulk_create(
+        [
+            ShoppingListItem(
+                user_id=user_id,
+                ingredient_id=ingredient_id,
+                amount=0
+            )
+            for user_id in user_ids
+            for ingredient_id, amount in amounts.items()
+            if amount > 0
+        ],
+        ignore_conflicts=True
+    )
+    ShoppingListItem.objects.filter(
+        user_id__in=user_ids,
+        ingredient_id__in=amounts,
+    ).update(
+        amount=F('amount') + Case(
+            *[
+                When(ingredient_id=ingredient_id, then=Value(amount))
+                for ingredient_id, amount in amounts.items()
+            ]
+        )
+    )
+    if any(amount < 0 for amount in amounts.values()):
+        ShoppingListItem.objects.filter(
+            user_id__in=user_ids,
+            amount__lte=0,
+        ).delete()
+
+
+def add_recipes(user_id, recipe_ids):
+    change_amounts([user_id], get_recipes_amounts(recipe_ids), 1)
+
+
+def remove_recipes(user_id, recipe_ids):
+    change_amounts([user_id], get_recipes_amounts(recipe_ids), -1)
+
+
+def add_recipe_ingredients(recipe_id, amounts):
+    change_amounts(get_cart_user_ids(recipe_id), amounts, 1)
+
+
+def remove_recipe_ingredients(recipe_id, amounts):
+    change_amounts(get_cart_user_ids(recipe_id), amounts, -1)
+
+
+def replace_recipe_ingredients(recipe_id, previous_amounts, amounts):
+    change_amounts(
+        get_cart_user_ids(recipe_id),
+        {
+            ingredient_id: (
+                amounts.get(ingredient_id, 0)
+                - previous_amounts.get(ingredient_id, 0)
+            )
+            for ingredient_id in {*previous_amounts, *amounts}
+        },
+        1
+    )
+
+
+@transaction.atomic
+def rebuild(user_ids=None):
+    items = ShoppingListItem.objects.all()
+    carts = ShoppingCart.objects.all()
+    if user_ids is not None:
+        items = items.filter(user_id__in=user_ids)
+        carts = carts.filter(user_id__in=user_ids)
+    items.delete()
+    totals = carts.values_list(
+        'user_id', 'recipe__recipe_ingredient__ingredient_id'
+    ).annotate(
+        total=Sum('recipe__recipe_ingredient__amount')
+    ).order_by()
+    batch = []
+    for user_id, ingredient_id, total in totals.iterator():
+        if ingredient_id is None:
+            continue
+        batch.append(
+            ShoppingListItem(
+                user_id=user_id,
+                ingredient_id=ingredient_id,
+                amount=total
+            )
+        )
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            ShoppingListItem.objects.bulk_create(batch)
+            batch = []
+    ShoppingListItem.objects.bulk_create(batch)
@@ -0,0 +1,55 @@
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from . import relations, shopping_list
+from .models import Recipe, RecipeIngredient, RecipeTombstone, ShoppingCart
+
+
+@receiver(post_save, sender=ShoppingCart)
+def add_cart_recipe_to_shopping_list(sender, instance, created, **kwargs):
+    if created:
+        shopping_list.add_recipes(instance.user_id, [instance.recipe_id])
+
+
+@receiver(post_delete, sender=ShoppingCart)
+def remove_cart_recipe_from_shopping_list(sender, instance, **kwargs):
+    shopping_list.remove_recipes(instance.user_id, [instance.recipe_id])
+
+
+@receiver(pre_save, sender=RecipeIngredient)
+def remember_previous_recipe_ingredient(sender, instance, **kwargs):
+    instance.previous_values = None
+    if instance.pk is not None:
+        instance.previous_values = RecipeIngredient.objects.filter(
+            pk=instance.pk
+        ).values_list('ingredient_id', 'amount').first()
+
+
+@receiver(post_save, sender=RecipeIngredient)
+def update_shopping_lists_for_ingredient(sender, instance, **kwargs):
+    if instance.previous_values is not None:
+        ingredient_id, amount = instance.previous_values
+        shopping_list.remove_recipe_ingredients(
+            instance.recipe_id, {ingredient_id: amount}
+        )
+    shopping_list.add_recipe_ingredients(
+        instance.recipe_id, {instance.ingredient_id: instance.amount}
+    )
+
+
+@receiver(post_delete, sender=RecipeIngredient)
+def remove_ingredient_from_shopping_lists(sender, instance, **kwargs):
+    shopping_list.remove_recipe_ingredients(
+        instance.recipe_id, {instance.ingredient_id: instance.amount}
+    )
+
+
+@receiver(pre_delete, sender=Recipe)
+def create_relation_tombstones(sender, instance, using, **kwargs):
+    relations.bury_recipes([instance.pk], using)
+
+
+@receiver(post_delete, sender=Recipe)
+def create_recipe_tombstone(sender, instance, **kwargs):
+    RecipeTombstone.objects.create(recipe_id=instance.pk)
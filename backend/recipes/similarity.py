@@ -0,0 +1,169 @@
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from scipy import sparse
+
+from .models import Recipe, RecipeIngredient, SimilarRecipe, TagsRecipe
+
+TAG_WEIGHT = 0.5
+INSERT_BATCH_SIZE = 5000
+MAX_DOCUMENT_FREQUENCY = 0.05
+PRUNE_MIN_RECIPES = 1000
+
+
+def fetch_pairs(queryset, field):
+    pairs = np.fromiter(
+        (
+            value
+            for pair in queryset.values_list('recipe_id', field).iterator()
+            for value in pair
+        ),
+        dtype=np.int64,
+    )
+    return pairs[0::2], pairs[1::2]
+
+
+def build_feature_matrix(recipe_ids):
+    ingredient_recipes, ingredients = fetch_pairs(
+        RecipeIngredient.objects.order_by(), 'ingredient_id'
+    )
+    tag_recipes, tags = fetch_pairs(TagsRecipe.objects.order_by(), 'tag_id')
+    tag_offset = int(ingredients.max(initial=0)) + 1
+    rows = np.searchsorted(
+        recipe_ids, np.concatenate([ingredient_recipes, tag_recipes])
+    )
+    columns = np.concatenate([ingredients, tags + tag_offset])
+    weights = np.concatenate([
+        np.ones(len(ingredients)), np.full(len(tags), TAG_WEIGHT)
+    ])
+    matrix = sparse.csr_matrix(
+        (weights, (rows, columns)),
+        shape=(len(recipe_ids), tag_offset + int(tags.max(initial=0)) + 1),
+    )
+    matrix.sum_duplicates()
+    document_frequency = np.bincount(
+        matrix.indices, minlength=matrix.shape[1]
+    )
+    idf = np.log((1 + len(recipe_ids)) / (1 + document_frequency)) + 1
+    if len(recipe_ids) >= PRUNE_MIN_RECIPES:
+        idf[
+            document_frequency > MAX_DOCUMENT_FREQUENCY * len(recipe_ids)
+        ] = 0
+    matrix = matrix @ sparse.diags(idf)
+    matrix.eliminate_zeros()
+    norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A.ravel()
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def iter_neighbours(matrix, rows, top_k, chunk_size):
+    transposed = matrix.T.tocsc()
+    for start in range(0, len(rows), chunk_size):
+        chunk_rows = rows[start:start + chunk_size]
+        scores = (matrix[chunk_rows] @ transposed).tocsr()
+        for position, row in enumerate(chunk_rows):
+            begin, end = scores.indptr[position], scores.indptr[position + 1]
+            columns = scores.indices[begin:end]
+            values = scores.data[begin:end]
+            mask = (columns != row) & (values > 0)
+            columns, values = columns[mask], values[mask]
+            if len(values) > top_k:
+                best = np.argpartition(-values, top_k - 1)[:top_k]
+                columns, values = columns[best], values[best]
+            order = np.lexsort((columns, -values))
+            yield row, columns[order], values[order]
+
+
+def iter_id_batches(ids):
+    for start in range(0, len(ids), INSERT_BATCH_SIZE):
+        yield ids[start:start + INSERT_BATCH_SIZE].tolist()
+
+
+def get_list_thresholds(recipe_ids):
+    thresholds = {}
+    for batch in iter_id_batches(recipe_ids):
+        thresholds.update(
+            (recipe_id, (count, worst))
+            for recipe_id, count, worst in SimilarRecipe.objects.filter(
+                recipe_id__in=batch
+            ).values('recipe_id').annotate(
+                count=Count('id'), worst=Min('score')
+            ).values_list('recipe_id', 'count', 'worst').order_by()
+        )
+    return thresholds
+
+
+def find_affected_rows(matrix, all_ids, rows, top_k, chunk_size):
+    affected = [rows]
+    for batch in iter_id_batches(all_ids[rows]):
+        affected.append(np.searchsorted(all_ids, np.fromiter(
+            SimilarRecipe.objects.filter(similar_id__in=batch).values_list(
+                'recipe_id', flat=True
+            ).iterator(),
+            dtype=np.int64,
+        )))
+    transposed = matrix.T.tocsc()
+    for start in range(0, len(rows), chunk_size):
+        scores = matrix[rows[start:start + chunk_size]] @ transposed
+        best = scores.max(axis=0).toarray().ravel()
+        candidates = np.flatnonzero(best > 0)
+        thresholds = get_list_thresholds(all_ids[candidates])
+        affected.append(np.array([
+            row for row in candidates.tolist()
+            if thresholds.get(int(all_ids[row]), (0, 0))[0] < top_k
+            or best[row] >= thresholds[int(all_ids[row])][1]
+        ], dtype=np.int64))
+    return np.unique(np.concatenate(affected))
+
+
+def rebuild_similar_recipes(recipe_ids=None, top_k=None, chunk_size=512,
+                            changed_since=None):
+    top_k = top_k or settings.SIMILAR_RECIPES_TOP_K
+    all_ids = np.fromiter(
+        Recipe.objects.order_by('id').values_list('id', flat=True).iterator(),
+        dtype=np.int64,
+    )
+    if not len(all_ids):
+        SimilarRecipe.objects.all().delete()
+        return 0
+    matrix = build_feature_matrix(all_ids)
+    if changed_since is not None:
+        recipe_ids = list(Recipe.objects.filter(
+            updated_at__gte=changed_since
+        ).values_list('id', flat=True))
+    if recipe_ids is None:
+        rows = np.arange(len(all_ids))
+        stale = SimilarRecipe.objects.all()
+    else:
+        rows = np.searchsorted(
+            all_ids,
+            np.intersect1d(all_ids, np.asarray(recipe_ids, dtype=np.int64)),
+        )
+        rows = find_affected_rows(matrix, all_ids, rows, top_k, chunk_size)
+        stale = SimilarRecipe.objects.filter(
+            recipe_id__in=all_ids[rows].tolist()
+        )
+    created = 0
+    batch = []
+    with transaction.atomic():
+        stale.delete()
+        for row, columns, values in iter_neighbours(
+            matrix, rows, top_k, chunk_size
+        ):
+            recipe_id = int(all_ids[row])
+            batch.extend(
+                SimilarRecipe(
+                    recipe_id=recipe_id,
+                    similar_id=int(all_ids[column]),
+                    score=float(value),
+                    rank=rank,
+                )
+                for rank, (column, value) in enumerate(zip(columns, values))
+            )
+            if len(batch) >= INSERT_BATCH_SIZE:
+                SimilarRecipe.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        SimilarRecipe.objects.bulk_create(batch)
+    return created + len(batch)
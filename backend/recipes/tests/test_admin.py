@@ -0,0 +1,93 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.tests.base import (create_ingredient, create_recipe, create_tag,
+                             create_user)
+from recipes import relations
+from recipes.models import Favorite, Ingredient, Recipe, ShoppingCart, Tag
+
+CHANGELIST_MODELS = (Recipe, Favorite, ShoppingCart, Ingredient, Tag)
+
+
+class AdminQueryCountTests(TestCase):
+
+    def setUp(self):
+        self.admin = create_user('admin', is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+        self.seeded = 0
+
+    def seed(self, count):
+        for number in range(self.seeded, self.seeded + count):
+            author = create_user(f'author{number}')
+            recipe = create_recipe(
+                author,
+                name=f'Рецепт {number}',
+                ingredients={
+                    create_ingredient(f'Ингредиент {number}'): 10,
+                    create_ingredient(f'Специя {number}'): 1,
+                },
+                tags=[create_tag(f'tag{number}')],
+            )
+            relations.favorites.add_many(author, [recipe.id])
+            relations.shopping_cart.add_many(author, [recipe.id])
+            relations.favorites.add_many(self.admin, [recipe.id])
+        self.seeded += count
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def assert_constant_queries(self, get_urls, limit):
+        self.seed(3)
+        for url in get_urls():
+            self.client.get(url)
+        small = [self.count_queries(url) for url in get_urls()]
+        self.seed(30)
+        large = [self.count_queries(url) for url in get_urls()]
+        self.assertEqual(large, small, get_urls())
+        self.assertLessEqual(max(large), limit, get_urls())
+
+    def get_changelist_url(self, model):
+        return reverse(
+            f'admin:{model._meta.app_label}_{model._meta.model_name}_'
+            'changelist'
+        )
+
+    def test_changelists(self):
+        self.assert_constant_queries(lambda: [
+            self.get_changelist_url(model)
+            for model in (*CHANGELIST_MODELS, type(self.admin))
+        ], 10)
+
+    def test_changelist_counts_only_filtered_rows(self):
+        self.seed(3)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.get_changelist_url(Recipe) + '?q=Рецепт')
+        counts = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT COUNT(')
+        ]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('WHERE', counts[0])
+        self.assertNotIn('recipes_favorite', counts[0])
+
+    def test_change_forms(self):
+        self.assert_constant_queries(lambda: [
+            reverse(
+                'admin:recipes_recipe_change',
+                args=[Recipe.objects.latest('id').id],
+            ),
+            reverse('admin:users_userprofile_change', args=[self.admin.id]),
+        ], 15)
+
+    def test_recipe_delete_confirmation(self):
+        self.assert_constant_queries(lambda: [
+            reverse(
+                'admin:recipes_recipe_delete',
+                args=[Recipe.objects.latest('id').id],
+            ),
+        ], 15)
@@ -0,0 +1,117 @@
+from django.apps import apps
+from django.db import transaction
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+
+from core.tests.base import (create_ingredient, create_recipe, create_tag,
+                             create_user)
+from recipes import relations
+from recipes.deletion import delete_recipes, delete_users
+from recipes.models import (FavoriteTombstone, Recipe, RecipeTombstone,
+                            ShoppingCartTombstone, ShoppingListItem, User)
+
+REBUILT_MODELS = (
+    RecipeTombstone,
+    FavoriteTombstone,
+    ShoppingCartTombstone,
+    ShoppingListItem,
+)
+VOLATILE_FIELDS = ('id', 'deleted_at')
+
+
+class Rollback(Exception):
+    pass
+
+
+def get_state():
+    state = {}
+    for model in apps.get_models(include_auto_created=True):
+        if model._meta.app_label not in ('recipes', 'users', 'authtoken'):
+            continue
+        fields = [field.attname for field in model._meta.concrete_fields]
+        if model in REBUILT_MODELS:
+            fields = [
+                field for field in fields if field not in VOLATILE_FIELDS
+            ]
+        state[model._meta.label] = sorted(
+            model._base_manager.values_list(*fields)
+        )
+    return state
+
+
+def get_counts(deleted):
+    return {label: count for label, count in deleted[1].items() if count}
+
+
+class CollectorParityTests(TestCase):
+
+    def setUp(self):
+        salt = create_ingredient('Соль')
+        sugar = create_ingredient('Сахар')
+        tag = create_tag('breakfast')
+        self.authors = [create_user(f'author{number}') for number in range(3)]
+        self.reader = create_user('reader')
+        for author in self.authors:
+            Token.objects.create(user=author)
+            for number in range(3):
+                create_recipe(
+                    author,
+                    name=f'{author.username} {number}',
+                    ingredients={salt: number + 1, sugar: 10},
+                    tags=[tag],
+                )
+        recipe_ids = list(Recipe.objects.values_list('id', flat=True))
+        for user in [*self.authors, self.reader]:
+            relations.favorites.add_many(user, recipe_ids[::2])
+            relations.shopping_cart.add_many(user, recipe_ids[1::2])
+            user.subscription.set(self.authors)
+
+    def assert_same_as_collector(self, queryset, delete):
+        try:
+            with transaction.atomic():
+                expected_counts = get_counts(queryset.all().delete())
+                expected_state = get_state()
+                raise Rollback
+        except Rollback:
+            pass
+        counts = get_counts(delete(queryset.all(), batch_size=2))
+        state = get_state()
+        for label in state:
+            self.assertEqual(state[label], expected_state[label], label)
+        self.assertEqual(counts, expected_counts)
+
+    def test_delete_users_matches_collector(self):
+        self.assert_same_as_collector(
+            User.objects.filter(pk__in=[
+                self.authors[0].pk, self.authors[1].pk
+            ]),
+            delete_users,
+        )
+
+    def test_delete_recipes_matches_collector(self):
+        self.assert_same_as_collector(
+            Recipe.objects.filter(author__in=self.authors[1:]),
+            delete_recipes,
+        )
+
+    def test_delete_users_is_atomic(self):
+        before = get_state()
+        queryset = User.objects.filter(pk__in=[
+            author.pk for author in self.authors
+        ])
+        original = relations.bury_recipes
+        calls = []
+
+        def failing_bury_recipes(recipe_ids, using):
+            calls.append(recipe_ids)
+            if len(calls) == 2:
+                raise Rollback
+            original(recipe_ids, using)
+
+        relations.bury_recipes = failing_bury_recipes
+        try:
+            with self.assertRaises(Rollback):
+                delete_users(queryset, batch_size=2)
+        finally:
+            relations.bury_recipes = original
+        self.assertEqual(get_state(), before)
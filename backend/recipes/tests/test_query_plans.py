@@ -0,0 +1,43 @@
+from django.apps import apps
+from django.test import TestCase
+
+from core.tests.base import create_recipe, create_user, requires_postgresql
+from recipes.query_plans import explain_hot_queries, get_hot_queries
+
+
+def get_declared_index_names():
+    names = set()
+    for model in apps.get_models(include_auto_created=True):
+        names.update(index.name for index in model._meta.indexes)
+        names.update(
+            constraint.name for constraint in model._meta.constraints
+        )
+    return names
+
+
+class QueryPlanTests(TestCase):
+
+    def test_expected_indexes_are_declared_in_models(self):
+        declared = get_declared_index_names()
+        self.assertEqual(
+            [
+                index_name for _, _, index_name in get_hot_queries()
+                if index_name not in declared
+            ],
+            [],
+        )
+
+    @requires_postgresql
+    def test_hot_queries_use_expected_indexes(self):
+        author = create_user('author')
+        reader = create_user('reader')
+        reader.subscription.add(author)
+        create_recipe(author)
+        self.assertEqual(
+            [
+                (name, index_name)
+                for name, index_name, plan in explain_hot_queries('default')
+                if index_name not in plan
+            ],
+            [],
+        )
@@ -0,0 +1,112 @@
+import random
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core.tests.base import (benchmark, bulk_create_recipes, bulk_create_users,
+                             create_ingredient, create_recipe, create_user,
+                             measure, report)
+from recipes.models import Ingredient, Recipe, RecipeIngredient, SimilarRecipe
+from recipes.similarity import rebuild_similar_recipes
+
+
+def get_similar(recipe):
+    return list(SimilarRecipe.objects.filter(recipe=recipe).order_by(
+        'rank'
+    ).values_list('similar_id', flat=True))
+
+
+class IncrementalRebuildTests(TestCase):
+
+    def setUp(self):
+        self.author = create_user('author')
+        self.ingredients = {
+            name: create_ingredient(name) for name in 'abcdef'
+        }
+        self.recipes = {
+            names: self.create_recipe(names)
+            for names in ('ab', 'ac', 'cd', 'e', 'ef')
+        }
+        rebuild_similar_recipes(top_k=1)
+
+    def create_recipe(self, names):
+        return create_recipe(self.author, names, ingredients={
+            self.ingredients[name]: 1 for name in names
+        })
+
+    def test_new_recipe_enters_neighbour_lists(self):
+        changed_since = timezone.now()
+        recipe = self.create_recipe('ab')
+        rebuild_similar_recipes(top_k=1, changed_since=changed_since)
+        self.assertEqual(get_similar(recipe), [self.recipes['ab'].id])
+        self.assertEqual(get_similar(self.recipes['ab']), [recipe.id])
+        self.assertEqual(
+            get_similar(self.recipes['ef']), [self.recipes['e'].id]
+        )
+
+    def test_changed_recipe_leaves_old_neighbour_lists(self):
+        self.assertEqual(
+            get_similar(self.recipes['cd']), [self.recipes['ac'].id]
+        )
+        changed_since = timezone.now()
+        recipe = self.recipes['ac']
+        recipe.ingredients.set([self.ingredients['e']], through_defaults={
+            'amount': 1
+        })
+        recipe.save()
+        rebuild_similar_recipes(top_k=1, changed_since=changed_since)
+        self.assertEqual(get_similar(self.recipes['cd']), [])
+        self.assertEqual(get_similar(recipe), [self.recipes['e'].id])
+
+    def test_command_rebuilds_recently_changed(self):
+        SimilarRecipe.objects.all().delete()
+        call_command(
+            'rebuild_similar_recipes',
+            '--changed-within', '3600',
+            '--top-k', '1',
+            stdout=StringIO(),
+        )
+        self.assertEqual(
+            get_similar(self.recipes['ab']), [self.recipes['ac'].id]
+        )
+
+
+@benchmark
+class SimilarRecipesBenchmark(TestCase):
+
+    def test_incremental_rebuild_100k(self):
+        rng = random.Random(0)
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'ингредиент {number}', measurement_unit='г')
+            for number in range(2000)
+        )
+        ingredient_ids = list(Ingredient.objects.values_list('id', flat=True))
+        bulk_create_recipes(bulk_create_users(100), 1000)
+        RecipeIngredient.objects.bulk_create(
+            (
+                RecipeIngredient(
+                    recipe_id=recipe_id, ingredient_id=ingredient_id, amount=1
+                )
+                for recipe_id in Recipe.objects.values_list('id', flat=True)
+                for ingredient_id in rng.sample(ingredient_ids, 6)
+            ),
+            batch_size=5000,
+        )
+        full = measure(rebuild_similar_recipes)
+        changed_since = timezone.now()
+        Recipe.objects.filter(
+            id__in=rng.sample(
+                list(Recipe.objects.values_list('id', flat=True)), 20
+            )
+        ).update(updated_at=timezone.now())
+        incremental = measure(
+            lambda: rebuild_similar_recipes(changed_since=changed_since)
+        )
+        report(
+            '100 000 рецептов, пересчёт похожих, с',
+            full=full,
+            incremental=incremental,
+        )
+        self.assertLess(incremental, full)
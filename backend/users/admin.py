@@ -1,10 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
+from core.admin import (BulkDeleteAdminMixin, CsvExportAdminMixin,
+                        LargeTableAdminMixin)
+from recipes.deletion import delete_users
+from recipes.export import USER_EXPORT_FIELDS
+
 User = get_user_model()
 
 
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(BulkDeleteAdminMixin, CsvExportAdminMixin,
+                LargeTableAdminMixin, admin.ModelAdmin):
 
     fieldsets = [
         ('Данные пользователя', {'fields': [
@@ -29,6 +35,16 @@ class UserAdmin(admin.ModelAdmin):
     )
     search_fields = ('email', 'username')
     list_filter = ('is_staff',)
+    export_fields = USER_EXPORT_FIELDS
+
+    def formfield_for_manytomany(self, db_field, request=None, **kwargs):
+        if db_field.name == 'user_permissions':
+            kwargs['queryset'] = db_field.remote_field.model.objects.all(
+            ).select_related('content_type')
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+
+    def delete_objects(self, queryset):
+        return delete_users(queryset)
 
 
 admin.site.register(User, UserAdmin)
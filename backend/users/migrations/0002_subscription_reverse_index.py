@@ -0,0 +1,40 @@
+# Generated by Django 3.2.3 on 2026-10-19 11:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Subscription',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('from_userprofile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                        ('to_userprofile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'users_userprofile_subscription',
+                        'unique_together': {('from_userprofile', 'to_userprofile')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='userprofile',
+                    name='subscription',
+                    field=models.ManyToManyField(blank=True, help_text='Подписка пользователя на других пользователей', through='users.Subscription', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['to_userprofile', 'from_userprofile'], name='users_subscription_to_from_idx'),
+        ),
+    ]
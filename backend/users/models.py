@@ -12,7 +12,7 @@ class UserProfile(AbstractUser):
     first_name = models.CharField(max_length=settings.USER_PROFILE_NAME_MAX,)
     last_name = models.CharField(max_length=settings.USER_PROFILE_NAME_MAX,)
     subscription = models.ManyToManyField(
-        'self', blank=True, symmetrical=False,
+        'self', through='Subscription', blank=True, symmetrical=False,
         help_text='Подписка пользователя на других пользователей',
     )
     avatar = models.ImageField(
@@ -29,3 +29,26 @@ class UserProfile(AbstractUser):
         'first_name',
         'last_name',
     )
+
+
+class Subscription(models.Model):
+    from_userprofile = models.ForeignKey(
+        UserProfile,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    to_userprofile = models.ForeignKey(
+        UserProfile,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+
+    class Meta:
+        db_table = 'users_userprofile_subscription'
+        unique_together = [('from_userprofile', 'to_userprofile')]
+        indexes = [
+            models.Index(
+                fields=['to_userprofile', 'from_userprofile'],
+                name='users_subscription_to_from_idx',
+            ),
+        ]